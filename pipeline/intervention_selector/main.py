@@ -2,55 +2,196 @@
 
 import base64
 import binascii
-import json
 import logging
 import os
+import re
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+from uuid import UUID, uuid4, uuid5
 
 from cloudevents.http import CloudEvent
+import flask
 import functions_framework
+import msgspec
+import orjson
+from cachetools import TTLCache
 
-from src.bigquery_client import BigQueryClient
+from src.bigquery_client import QUERY_EXECUTOR, BigQueryClient
+from src.payloads import STATE_ESTIMATE_FIELDS, StateEstimatePayload, decode_state_estimate_payload
 from src.selector import select_intervention
 from src.catalog import get_intervention
-from src.apns import send_push_notification
+from src.apns import send_push_notification, warm_up as warm_up_apns
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# BigQuery client shared across warm invocations of this instance
+_BQ_CLIENT: Optional[BigQueryClient] = None
+_BQ_CLIENT_LOCK = threading.Lock()
 
-def process_state_estimate(user_id: str, timestamp: str) -> None:
-    """Process a state estimate and create/send intervention if needed.
 
-    Args:
-        user_id: User ID
-        timestamp: State estimate timestamp (ISO format)
+def _get_bq() -> BigQueryClient:
+    """Return the process-wide BigQueryClient, creating it on first use.
+
+    Raises:
+        ValueError: If GCP_PROJECT_ID is not set
+    """
+    global _BQ_CLIENT
+    if _BQ_CLIENT is None:
+        with _BQ_CLIENT_LOCK:
+            if _BQ_CLIENT is None:
+                project_id = os.getenv("GCP_PROJECT_ID")
+                if not project_id:
+                    raise ValueError("GCP_PROJECT_ID environment variable not set")
+                dataset_id = os.getenv("BQ_DATASET_ID", "shift_data")
+                _BQ_CLIENT = BigQueryClient(project_id=project_id, dataset_id=dataset_id)
+    return _BQ_CLIENT
+
+
+# Intervention ID from /interventions/{id} or /{id} (query string excluded)
+_PATH_RE = re.compile(r"^/(?:interventions/)?([^/?]*)")
+
+# Pub/Sub message IDs already handled by this instance. Redeliveries of the
+# same message (Cloud Functions retries) are dropped without re-querying.
+_PROCESSED_MESSAGES: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+_PROCESSED_MESSAGES_LOCK = threading.Lock()
+
+# Namespace for intervention_instance_ids derived from Pub/Sub message IDs, so a
+# redelivery handled by another instance reuses the same ID
+_INTERVENTION_ID_NAMESPACE = UUID("6f1f5c3e-8a2d-4b7e-9c41-2d5e8f0a7b93")
+
+# Pending lookups keyed by intervention_instance_id. Concurrent requests for the
+# same ID (e.g. push retries) wait on the first request's future instead of
+# each issuing their own BigQuery queries.
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _single_flight(key: str, fn: Callable[[], Any]) -> Any:
+    """Run fn once for all concurrent callers sharing key.
+
+    The first caller executes fn; followers block on its result (or exception).
+    The entry is removed once fn completes, so later calls run fn again.
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _INFLIGHT[key] = future
+
+    if not is_leader:
+        return future.result()
+
+    try:
+        result = fn()
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _load_intervention(
+    bq_client: BigQueryClient, intervention_instance_id: str
+) -> Tuple[Optional[dict], Optional[dict]]:
+    """Fetch an intervention instance and its catalog entry.
+
+    Returns:
+        Tuple of (instance, catalog intervention); either may be None
+    """
+    instance = bq_client.get_intervention_instance(intervention_instance_id)
+    if not instance:
+        return None, None
+    return instance, get_intervention(instance["intervention_key"], bq_client)
+
+
+def _warm_up() -> None:
+    """Open the BigQuery and APNs connections before the first real request."""
+    try:
+        _get_bq().client.query("SELECT 1").result()
+        logger.info("BigQuery connection warmed up")
+    except Exception as e:
+        logger.warning("Warmup failed, first request will pay connection setup: %s", e)
+    warm_up_apns()
+
+
+def _json_response(body: Dict[str, Any], status: int) -> flask.Response:
+    """Serialize an HTTP response body with orjson.
+
+    datetime values are emitted as ISO 8601 directly; naive datetimes are
+    treated as UTC.
     """
-    project_id = os.getenv("GCP_PROJECT_ID")
-    if not project_id:
-        raise ValueError("GCP_PROJECT_ID environment variable not set")
+    return flask.Response(
+        orjson.dumps(body, option=orjson.OPT_NAIVE_UTC),
+        status=status,
+        mimetype="application/json",
+    )
 
-    dataset_id = os.getenv("BQ_DATASET_ID", "shift_data")
-    bq_client = BigQueryClient(project_id=project_id, dataset_id=dataset_id)
 
-    # Get latest state estimate for user (should match the timestamp from Pub/Sub)
-    state_estimate = bq_client.get_latest_state_estimate(user_id)
-    if not state_estimate:
-        logger.warning(f"No state estimate found for user {user_id}")
+def _stream_interventions(first: Optional[dict], rest: Iterator[dict]) -> Iterator[bytes]:
+    """Yield the list endpoint body ({"interventions": [...]}) one row at a time.
+
+    Args:
+        first: First intervention, or None if there are none
+        rest: Remaining interventions
+    """
+    if first is None:
+        yield b'{"interventions":[]}'
         return
+    yield b'{"interventions":[' + orjson.dumps(first, option=orjson.OPT_NAIVE_UTC)
+    for intervention in rest:
+        yield b"," + orjson.dumps(intervention, option=orjson.OPT_NAIVE_UTC)
+    yield b"]}"
 
-    # Verify this is the state estimate we're processing
-    if state_estimate["timestamp"].isoformat() != timestamp:
-        logger.warning(
-            f"State estimate timestamp mismatch: expected {timestamp}, got {state_estimate['timestamp'].isoformat()}"
-        )
 
+def _state_estimate_from_payload(payload: StateEstimatePayload) -> Optional[dict]:
+    """Build a state estimate dict from a state_estimates message payload.
+
+    Returns:
+        State estimate dict, or None if the message predates the publisher
+        including state fields
+    """
+    state_estimate = {"user_id": payload.user_id, "timestamp": payload.timestamp}
+    for field in STATE_ESTIMATE_FIELDS:
+        value = getattr(payload, field)
+        if value is msgspec.UNSET:
+            return None
+        state_estimate[field] = value
+    return state_estimate
+
+
+def _create_intervention(
+    bq_client: BigQueryClient,
+    user_id: str,
+    state_estimate: dict,
+    message_id: Optional[str] = None,
+    surface_prefs: Optional[Dict[str, dict]] = None,
+) -> Optional[Tuple[str, dict]]:
+    """Select an intervention for a state estimate and record its instance.
+
+    Args:
+        bq_client: BigQueryClient instance
+        user_id: User ID
+        state_estimate: State estimate dict (stress, trace_id, ...)
+        message_id: Triggering Pub/Sub message ID; when given, the instance ID
+            is derived from it so redeliveries produce the same ID
+        surface_prefs: Surface preferences already fetched for the user
+
+    Returns:
+        Tuple of (intervention_instance_id, intervention) or None if no
+        intervention was selected or a duplicate getting_started was skipped
+    """
     # Select intervention based on state estimate and preferences
-    intervention = select_intervention(state_estimate, bq_client, user_id)
+    intervention = select_intervention(state_estimate, bq_client, user_id, surface_prefs=surface_prefs)
     if not intervention:
-        logger.info(f"No intervention selected for user {user_id}")
-        return
+        logger.info("No intervention selected for user %s", user_id)
+        return None
 
     # Check for duplicate getting_started instances before creating
     # Only dedup if flow is NOT completed (allows new versions after completion)
@@ -75,19 +216,22 @@ def process_state_estimate(user_id: str, timestamp: str) -> None:
             )
             if existing_instance:
                 logger.info(
-                    f"getting_started instance already exists for user {user_id} "
-                    f"(instance_id: {existing_instance}, key: {intervention['intervention_key']}), "
-                    f"flow version {version} not completed, skipping creation"
+                    "getting_started instance already exists for user %s "
+                    "(instance_id: %s, key: %s), "
+                    "flow version %s not completed, skipping creation",
+                    user_id,
+                    existing_instance,
+                    intervention["intervention_key"],
+                    version,
                 )
-                return
+                return None
 
     # Create intervention instance
     # CRITICAL: trace_id is REQUIRED for 100% traceability
     trace_id = state_estimate.get("trace_id")
     if not trace_id:
-        from uuid import uuid4
         trace_id = str(uuid4())
-        logger.error(f"⚠️ CRITICAL: Missing trace_id in state_estimate for user {user_id}! Generated: {trace_id}")
+        logger.error("⚠️ CRITICAL: Missing trace_id in state_estimate for user %s! Generated: %s", user_id, trace_id)
     
     intervention_instance_id = bq_client.create_intervention_instance(
         user_id=user_id,
@@ -96,10 +240,70 @@ def process_state_estimate(user_id: str, timestamp: str) -> None:
         surface=intervention["surface"],
         intervention_key=intervention["intervention_key"],
         trace_id=trace_id,
+        intervention_instance_id=str(uuid5(_INTERVENTION_ID_NAMESPACE, message_id)) if message_id else None,
     )
 
+    return intervention_instance_id, intervention
+
+
+def process_state_estimate(
+    user_id: str,
+    timestamp: str,
+    state_estimate: Optional[dict] = None,
+    message_id: Optional[str] = None,
+) -> None:
+    """Process a state estimate and create/send intervention if needed.
+
+    Args:
+        user_id: User ID
+        timestamp: State estimate timestamp (ISO format)
+        state_estimate: State estimate carried in the Pub/Sub message. If None
+            (older message format), the latest estimate is read from BigQuery.
+        message_id: Pub/Sub message ID, from which the intervention instance
+            ID is derived so a redelivery reuses it
+    """
+    bq_client = _get_bq()
+
+    # Prefetch the device token concurrently with the rest of selection when
+    # the message carries the state estimate, unless it has no stress score
+    # (only getting_started is possible then, so the lookup is likely wasted)
+    device_token_future = None
+    if state_estimate is not None and state_estimate.get("stress") is not None:
+        device_token_future = QUERY_EXECUTOR.submit(bq_client.get_device_token, user_id)
+
+    # Get latest state estimate for user (should match the timestamp from Pub/Sub),
+    # with the device token and surface preferences, in one query
+    surface_prefs = None
+    has_context = False
+    if state_estimate is None:
+        context = bq_client.get_user_context(user_id)
+        state_estimate = context["state"]
+        device_token = context["device_token"]
+        surface_prefs = context["preferences"]
+        has_context = True
+        if not state_estimate:
+            logger.warning("No state estimate found for user %s", user_id)
+            return
+
+        # Verify this is the state estimate we're processing
+        if state_estimate["timestamp"].isoformat() != timestamp:
+            logger.warning(
+                "State estimate timestamp mismatch: expected %s, got %s",
+                timestamp,
+                state_estimate["timestamp"].isoformat(),
+            )
+
+    # Select intervention and create its instance
+    created = _create_intervention(bq_client, user_id, state_estimate, message_id, surface_prefs)
+    if not created:
+        return
+    intervention_instance_id, intervention = created
+
     # Get device token (from table or fallback env var)
-    device_token = bq_client.get_device_token(user_id)
+    if device_token_future is not None:
+        device_token = device_token_future.result()
+    elif not has_context:
+        device_token = bq_client.get_device_token(user_id)
     if not device_token:
         # Try fallback from env var
         device_token = os.getenv("FALLBACK_DEVICE_TOKEN")
@@ -120,18 +324,21 @@ def process_state_estimate(user_id: str, timestamp: str) -> None:
                 status="sent",
                 sent_at=datetime.now(timezone.utc),
             )
-            logger.info(f"Successfully sent intervention {intervention_instance_id} to user {user_id}")
+            logger.info("Successfully sent intervention %s to user %s", intervention_instance_id, user_id)
         else:
             # APNs not configured or failed - keep as "created" for Phase 1 testing
             logger.info(
-                f"Push notification not sent for intervention {intervention_instance_id} "
+                "Push notification not sent for intervention %s "
                 "(APNs not configured or failed). Status remains 'created'. "
-                "Use HTTP endpoint to fetch intervention details."
+                "Use HTTP endpoint to fetch intervention details.",
+                intervention_instance_id,
             )
     else:
         logger.info(
-            f"No device token for user {user_id}. Intervention {intervention_instance_id} created. "
-            "Status: 'created'. Use HTTP endpoint to fetch intervention details."
+            "No device token for user %s. Intervention %s created. "
+            "Status: 'created'. Use HTTP endpoint to fetch intervention details.",
+            user_id,
+            intervention_instance_id,
         )
 
 
@@ -143,6 +350,13 @@ def intervention_selector(cloud_event: CloudEvent) -> None:
         cloud_event: CloudEvent from Pub/Sub
     """
     try:
+        # Redelivery of a message this instance already handled
+        message_id = cloud_event["id"]
+        with _PROCESSED_MESSAGES_LOCK:
+            if message_id in _PROCESSED_MESSAGES:
+                logger.info("Skipping already processed Pub/Sub message %s", message_id)
+                return
+
         # Extract message data from Pub/Sub CloudEvent
         message_data = cloud_event.get_data()
         if not message_data:
@@ -157,7 +371,7 @@ def intervention_selector(cloud_event: CloudEvent) -> None:
         #   },
         #   "subscription": "..."
         # }
-        payload: Dict[str, Any] | None = None
+        payload: StateEstimatePayload | None = None
 
         if isinstance(message_data, dict) and "message" in message_data:
             # Path 1: Correctly decode Pub/Sub enveloped message
@@ -166,44 +380,60 @@ def intervention_selector(cloud_event: CloudEvent) -> None:
 
             if isinstance(data_field, str):  # Pub/Sub data field is a base64 string
                 try:
-                    # Decode base64-encoded JSON payload
+                    # Decode and validate the base64-encoded JSON payload in
+                    # one pass (msgspec parses the bytes directly into a Struct)
                     data_bytes = base64.b64decode(data_field)
-                    decoded_data = data_bytes.decode("utf-8")
-                    payload = json.loads(decoded_data)
-                    logger.info(f"Received Pub/Sub message (decoded from envelope): {payload}")
-                except (binascii.Error, ValueError) as e:
-                    logger.error(f"Base64 decoding failed: {e}")
+                    payload = decode_state_estimate_payload(data_bytes)
+                    logger.info("Received Pub/Sub message (decoded from envelope): %s", payload)
+                except msgspec.ValidationError as e:
+                    logger.error("Invalid state estimate payload (%s): %r", e, data_bytes)
+                    return
+                except msgspec.DecodeError:
+                    logger.warning("Received non-JSON Pub/Sub message data: %r", data_bytes)
                     return
-                except json.JSONDecodeError:
-                    logger.warning(f"Received non-JSON Pub/Sub message data: {decoded_data}")
+                except (binascii.Error, ValueError) as e:
+                    logger.error("Base64 decoding failed: %s", e)
                     return
             else:
-                logger.warning(f"Pub/Sub message missing 'data' field or unexpected type: {type(data_field)}")
+                logger.warning("Pub/Sub message missing 'data' field or unexpected type: %s", type(data_field))
                 return
 
         if not payload:
             logger.warning("Decoded payload is empty or not handled by an expected format.")
             return
 
-        # Extract user_id and timestamp from payload
-        user_id = payload.get("user_id")
-        timestamp = payload.get("timestamp")
+        user_id = payload.user_id
+        timestamp = payload.timestamp
 
         if not user_id or not timestamp:
-            logger.error(f"Missing user_id or timestamp in payload: {payload}")
+            logger.error("Missing user_id or timestamp in payload: %s", payload)
             return
 
+        # Use the state estimate carried in the message when the publisher
+        # included it; older messages only carry user_id + timestamp
+        state_estimate = _state_estimate_from_payload(payload)
+
         # Process state estimate
-        logger.info(f"Processing state estimate for user {user_id} at {timestamp}")
-        process_state_estimate(user_id=user_id, timestamp=timestamp)
+        logger.info("Processing state estimate for user %s at %s", user_id, timestamp)
+        process_state_estimate(
+            user_id=user_id,
+            timestamp=timestamp,
+            state_estimate=state_estimate,
+            message_id=message_id,
+        )
+
+        # Only now is the message fully handled; a failure above leaves it
+        # unmarked so the retry is processed again
+        with _PROCESSED_MESSAGES_LOCK:
+            _PROCESSED_MESSAGES[message_id] = True
 
     except Exception as e:
-        logger.error(f"Error in intervention selector pipeline: {e}", exc_info=True)
+        logger.error("Error in intervention selector pipeline: %s", e, exc_info=True)
         raise  # Re-raise to trigger Cloud Function retry mechanism
 
 
 @functions_framework.http
-def get_intervention(request) -> tuple[Dict[str, Any], int]:
+def get_intervention(request) -> flask.Response:
     """HTTP endpoint to get intervention instance details or list interventions.
 
     Supports two patterns:
@@ -214,70 +444,83 @@ def get_intervention(request) -> tuple[Dict[str, Any], int]:
         request: Flask request object
 
     Returns:
-        Tuple of (response dict, status code)
+        JSON response
     """
     try:
         project_id = os.getenv("GCP_PROJECT_ID")
         if not project_id:
-            return {"error": "GCP_PROJECT_ID not configured"}, 500
+            return _json_response({"error": "GCP_PROJECT_ID not configured"}, 500)
 
-        dataset_id = os.getenv("BQ_DATASET_ID", "shift_data")
-        bq_client = BigQueryClient(project_id=project_id, dataset_id=dataset_id)
+        bq_client = _get_bq()
 
         # Check for query parameters (list endpoint)
         user_id = request.args.get("user_id")
         status = request.args.get("status", "created")
 
         if user_id:
-            # List interventions for user
-            interventions = bq_client.get_interventions_for_user(user_id=user_id, status=status)
-            return {"interventions": interventions}, 200
+            # List interventions for user, streamed as BigQuery pages arrive.
+            # Pull the first row here so query errors still map to a 500.
+            interventions = bq_client.iter_interventions_for_user(user_id=user_id, status=status)
+            first = next(interventions, None)
+            return flask.Response(
+                flask.stream_with_context(_stream_interventions(first, interventions)),
+                status=200,
+                mimetype="application/json",
+            )
 
         # Otherwise, treat as single intervention lookup by ID
-        path = request.path.rstrip("/")  # Remove trailing slash
-
         # Handle both /interventions/{id} and /{id} patterns
-        if path.startswith("/interventions/"):
-            intervention_instance_id = path.split("/interventions/", 1)[1].split("?")[0].split("/")[0]
-        elif path.startswith("/"):
-            # Allow root path for simpler routing
-            intervention_instance_id = path.lstrip("/").split("?")[0].split("/")[0]
-        else:
-            return {"error": "Invalid path. Expected /interventions/{id} or ?user_id={user_id}"}, 400
+        match = _PATH_RE.match(request.path)
+        if not match:
+            return _json_response({"error": "Invalid path. Expected /interventions/{id} or ?user_id={user_id}"}, 400)
+        intervention_instance_id = match.group(1)
 
         if not intervention_instance_id:
-            return {"error": "Missing intervention_instance_id"}, 400
+            return _json_response({"error": "Missing intervention_instance_id"}, 400)
 
-        # Get intervention instance
-        instance = bq_client.get_intervention_instance(intervention_instance_id)
+        # Get intervention instance and catalog details (shared with concurrent
+        # requests for the same ID)
+        instance, intervention = _single_flight(
+            intervention_instance_id,
+            lambda: _load_intervention(bq_client, intervention_instance_id),
+        )
         if not instance:
-            return {"error": "Intervention instance not found"}, 404
+            return _json_response({"error": "Intervention instance not found"}, 404)
 
-        # Get intervention details from catalog
-        intervention = get_intervention(instance["intervention_key"], bq_client)
         if not intervention:
-            return {"error": "Intervention not found in catalog"}, 500
+            return _json_response({"error": "Intervention not found in catalog"}, 500)
 
         # Return combined response
+        # CRITICAL: trace_id is REQUIRED for 100% traceability
+        trace_id = instance.get("trace_id")
+        if not trace_id:
+            trace_id = str(uuid4())
+            logger.error("⚠️ CRITICAL: Missing trace_id in intervention %s! Generated: %s", instance["intervention_instance_id"], trace_id)
+
         response = {
             "intervention_instance_id": instance["intervention_instance_id"],
             "user_id": instance["user_id"],
-            "trace_id": instance.get("trace_id"),
+            "trace_id": trace_id,  # REQUIRED - always included
             "metric": instance["metric"],
             "level": instance["level"],
             "surface": instance["surface"],
             "intervention_key": instance["intervention_key"],
             "title": intervention["title"],
             "body": intervention["body"],
-            "created_at": instance["created_at"].isoformat() if instance["created_at"] else None,
-            "scheduled_at": instance["scheduled_at"].isoformat() if instance["scheduled_at"] else None,
-            "sent_at": instance["sent_at"].isoformat() if instance["sent_at"] else None,
+            "created_at": instance["created_at"],
+            "scheduled_at": instance["scheduled_at"],
+            "sent_at": instance["sent_at"],
             "status": instance["status"],
         }
 
-        return response, 200
+        return _json_response(response, 200)
 
     except Exception as e:
-        logger.error(f"Error getting intervention instance: {e}", exc_info=True)
-        return {"error": "Internal server error"}, 500
+        logger.error("Error getting intervention instance: %s", e, exc_info=True)
+        return _json_response({"error": "Internal server error"}, 500)
+
 
+# Warm the BigQuery and APNs connections during container init so the first
+# event doesn't pay auth + TLS setup on its critical path.
+if os.getenv("GCP_PROJECT_ID"):
+    threading.Thread(target=_warm_up, name="bq-warmup", daemon=True).start()
@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+from functools import lru_cache
 from typing import Optional
 
 try:
@@ -18,6 +19,51 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _get_credentials(key_path: str, key_id: str, team_id: str):
+    """Return TokenCredentials for the given key, reused so the JWT is cached."""
+    return TokenCredentials(auth_key_path=key_path, auth_key_id=key_id, team_id=team_id)
+
+
+@lru_cache(maxsize=8)
+def _get_apns_client(key_path: str, key_id: str, team_id: str, use_sandbox: bool):
+    """Return an APNsClient for the given credentials.
+
+    Cached so warm invocations reuse the open HTTP/2 connection instead of
+    repeating the TLS handshake for every notification.
+    """
+    credentials = _get_credentials(key_path, key_id, team_id)
+    return APNsClient(credentials=credentials, use_sandbox=use_sandbox)
+
+
+def _build_payload(title: str, body: str, intervention_instance_id: str):
+    """Build the APNs payload for an intervention notification."""
+    return Payload(
+        alert={"title": title, "body": body},
+        sound="default",
+        badge=1,
+        custom={"intervention_instance_id": intervention_instance_id},
+    )
+
+
+def warm_up() -> None:
+    """Open the APNs connection ahead of the first notification, if configured."""
+    if APNsClient is None:
+        return
+
+    key_id = os.getenv("APNS_KEY_ID")
+    team_id = os.getenv("APNS_TEAM_ID")
+    key_path = os.getenv("APNS_KEY_PATH")
+    if not all([key_id, team_id, key_path]):
+        return
+
+    try:
+        _get_apns_client(key_path, key_id, team_id, True).connect()
+        logger.info("APNs connection warmed up")
+    except Exception as e:
+        logger.warning(f"APNs warmup failed: {e}")
+
+
 def send_push_notification(
     device_token: str,
     title: str,
@@ -60,17 +106,11 @@ def send_push_notification(
         return False
 
     try:
-        # Initialize APNs client with token-based auth
-        credentials = TokenCredentials(auth_key_path=key_path, auth_key_id=key_id, team_id=team_id)
-        client = APNsClient(credentials=credentials, use_sandbox=True)  # Use sandbox for dev
+        # Reuse cached APNs client with token-based auth
+        client = _get_apns_client(key_path, key_id, team_id, True)  # Use sandbox for dev
 
         # Create payload with notification and custom data
-        payload = Payload(
-            alert={"title": title, "body": body},
-            sound="default",
-            badge=1,
-            custom={"intervention_instance_id": intervention_instance_id},
-        )
+        payload = _build_payload(title, body, intervention_instance_id)
 
         # Send notification
         topic = bundle_id
@@ -83,23 +123,3 @@ def send_push_notification(
         logger.error(f"Error sending push notification: {e}", exc_info=True)
         return False
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
@@ -1,15 +1,503 @@
 """BigQuery client for reading state estimates and writing intervention instances."""
 
+import functools
 import logging
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
-from uuid import uuid4
+from typing import Iterator, Optional
+from uuid import UUID
 
-from google.cloud import bigquery
+from cachetools import TTLCache
+from google.cloud import bigquery, bigquery_storage_v1
+
+from src.storage_write import (
+    INTERVENTION_INSTANCE_EVENT_FIELDS,
+    INTERVENTION_INSTANCE_FIELDS,
+    StorageWriter,
+)
 
 logger = logging.getLogger(__name__)
 
+# google.cloud.bigquery.Client instances keyed by project_id. Shared across
+# BigQueryClient instances so auth tokens and HTTP connections are reused;
+# callers must not change settings on the shared client.
+_GCP_CLIENTS: dict[str, bigquery.Client] = {}
+_GCP_CLIENTS_LOCK = threading.Lock()
+
+# Bound on query job runtime so a stuck job can't hold up the pipeline
+_JOB_TIMEOUT_MS = 30_000
+
+# Small single-row reads go through jobs.query, which returns the first page of
+# results in the same response instead of inserting a job and polling for it
+_FAST_QUERY_API = bigquery.enums.QueryApiMethod.QUERY
+
+# Rows per legacy streaming insert request (well under the 50,000-row cap) and
+# how many such requests run at once
+_STREAMING_INSERT_CHUNK = 500
+_STREAMING_INSERT_WORKERS = 8
+
+# Rows fetched per result page for multi-row reads
+_LIST_PAGE_SIZE = 100
+
+# Result sets larger than this are read over the BigQuery Storage Read API
+# (Arrow record batches over gRPC) instead of paging JSON over REST
+_STORAGE_READ_MIN_ROWS = 50
+
+_read_client = None
+_read_client_lock = threading.Lock()
+
+# Worker threads shared by everything that overlaps independent BigQuery reads
+# within a request (device token prefetch, selection prefetches, the user
+# context fallback), so the function holds one pool rather than one per caller
+QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="bq-query")
+
+# Intervention instance lookups by ID. Instances in a terminal status no longer
+# change, so they are kept much longer than ones that may still be updated
+# ("sent" instances are still accepted or dismissed from the app).
+_TERMINAL_STATUSES = frozenset({"accepted", "dismissed", "failed"})
+_instance_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_terminal_cache: TTLCache = TTLCache(maxsize=50_000, ttl=3600)
+_instance_cache_lock = threading.Lock()
+
+# Catalog reads keyed by (project, dataset, metric, level) and (project,
+# dataset, intervention_key). The catalog is reference data that changes
+# rarely; CATALOG_TTL_SECONDS overrides how long reads are kept (default 5 minutes).
+_catalog_cache: TTLCache = TTLCache(maxsize=256, ttl=float(os.getenv("CATALOG_TTL_SECONDS", "300")))
+_catalog_cache_lock = threading.Lock()
+
+# The title/body index of the whole catalog, keyed by (project, dataset). Kept
+# apart from _catalog_cache so it can't collide with an intervention_key, with
+# the same TTL and guarded by the same lock.
+_catalog_content_cache: TTLCache = TTLCache(maxsize=4, ttl=float(os.getenv("CATALOG_TTL_SECONDS", "300")))
+
+# Catalog reads that found nothing (no interventions for a metric/level, or an
+# unknown intervention_key), same keys as _catalog_cache and guarded by its
+# lock. Kept briefly so bursts don't each query BigQuery, without hiding a
+# newly enabled intervention for the full catalog TTL.
+_catalog_miss_cache: TTLCache = TTLCache(maxsize=256, ttl=float(os.getenv("CATALOG_MISS_TTL_SECONDS", "10")))
+
+# Users last seen with no pending ("created") interventions, keyed by
+# (project, dataset, user_id). Instances only ever leave "created" after being
+# inserted, so an empty result stays valid until the next insert for the user.
+# Inserts from other function instances don't evict it, hence the short TTL.
+_no_pending_cache: TTLCache = TTLCache(maxsize=10_000, ttl=15)
+_no_pending_cache_lock = threading.Lock()
+
+# Per-user device token and surface preference reads, keyed by (project,
+# dataset, kind, user_id). Misses are cached too (_NOT_FOUND), so users without
+# a token don't re-query on every lookup.
+_user_cache: TTLCache = TTLCache(maxsize=20_000, ttl=30)
+_user_cache_lock = threading.Lock()
+_NOT_FOUND = object()
+
+# SQL for BigQueryClient queries. Table names are unqualified and resolved
+# against the job's default dataset.
+
+# state_estimates and app_interactions are not time-partitioned, so a date
+# guard (e.g. DATE(timestamp) >= ...) would not prune anything; these reads
+# rely on clustering by user_id instead (see terraform resources.tf).
+# Partitioning either table means recreating it.
+_SQL_LATEST_STATE_ESTIMATE = """
+    SELECT
+        user_id,
+        timestamp,
+        trace_id,
+        recovery,
+        readiness,
+        stress,
+        fatigue
+    FROM state_estimates
+    WHERE user_id = @user_id
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+
+_SQL_INTERVENTION_INSTANCE = """
+    SELECT
+        intervention_instance_id,
+        user_id,
+        trace_id,
+        metric,
+        level,
+        surface,
+        intervention_key,
+        created_at,
+        scheduled_at,
+        sent_at,
+        status
+    FROM intervention_instances_current
+    WHERE intervention_instance_id = @intervention_instance_id
+    LIMIT 1
+"""
+
+_SQL_DEVICE_TOKEN = """
+    SELECT device_token
+    FROM devices
+    WHERE user_id = @user_id
+    ORDER BY updated_at DESC
+    LIMIT 1
+"""
+
+_SQL_CATALOG_INTERVENTIONS = """
+    SELECT
+        intervention_key,
+        metric,
+        level,
+        target_level,
+        nudge_type,
+        persona,
+        surface,
+        title,
+        body,
+        enabled
+    FROM intervention_catalog
+    WHERE enabled = TRUE
+    AND metric = @metric
+    AND level = @level
+    ORDER BY intervention_key
+"""
+
+# Low-cardinality catalog columns interned when cached, so every cached entry
+# (and every copy handed to callers) shares one string object per value
+_CATALOG_INTERNED_FIELDS = ("metric", "level", "target_level", "nudge_type", "persona", "surface")
+
+_SQL_CATALOG_CONTENT = """
+    SELECT
+        intervention_key,
+        title,
+        body
+    FROM intervention_catalog
+"""
+
+_SQL_CATALOG_INTERVENTION_BY_KEY = """
+    SELECT
+        intervention_key,
+        metric,
+        level,
+        target_level,
+        nudge_type,
+        persona,
+        surface,
+        title,
+        body,
+        enabled
+    FROM intervention_catalog
+    WHERE intervention_key = @intervention_key
+    LIMIT 1
+"""
+
+# Preference stats returned per surface (nulls COALESCEd to zero in SQL)
+_SURFACE_PREFERENCE_FIELDS = (
+    "preference_score",
+    "annoyance_rate",
+    "ignore_rate",
+    "shown_count",
+    "engagement_rate",
+)
+
+_SQL_SURFACE_PREFERENCES = """
+    SELECT
+        surface,
+        COALESCE(shown_count, 0) AS shown_count,
+        COALESCE(preference_score, 0.0) AS preference_score,
+        COALESCE(annoyance_rate, 0.0) AS annoyance_rate,
+        COALESCE(ignore_rate, 0.0) AS ignore_rate,
+        COALESCE(engagement_rate, 0.0) AS engagement_rate
+    FROM surface_preferences
+    WHERE user_id = @user_id
+"""
+
+_SQL_USER_CONTEXT = """
+    SELECT
+        (
+            SELECT AS STRUCT
+                user_id,
+                timestamp,
+                trace_id,
+                recovery,
+                readiness,
+                stress,
+                fatigue
+            FROM state_estimates
+            WHERE user_id = @user_id
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) AS state,
+        (
+            SELECT device_token
+            FROM devices
+            WHERE user_id = @user_id
+            ORDER BY updated_at DESC
+            LIMIT 1
+        ) AS device_token,
+        ARRAY(
+            SELECT AS STRUCT
+                surface,
+                COALESCE(shown_count, 0) AS shown_count,
+                COALESCE(preference_score, 0.0) AS preference_score,
+                COALESCE(annoyance_rate, 0.0) AS annoyance_rate,
+                COALESCE(ignore_rate, 0.0) AS ignore_rate,
+                COALESCE(engagement_rate, 0.0) AS engagement_rate
+            FROM surface_preferences
+            WHERE user_id = @user_id
+        ) AS preferences
+"""
+
+_SQL_HAS_COMPLETED_FLOW = """
+    WITH cte_events AS (
+        SELECT
+            event_type,
+            JSON_EXTRACT_SCALAR(payload, '$.flow_id') AS flow_id,
+            JSON_EXTRACT_SCALAR(payload, '$.flow_version') AS flow_version,
+            JSON_EXTRACT_SCALAR(payload, '$.scope') AS scope,
+            timestamp
+        FROM app_interactions
+        WHERE user_id = @user_id
+          AND event_type IN ('flow_completed', 'flow_reset')
+          AND (
+            JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
+            OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'all'
+            OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'flows'
+          )
+        ORDER BY timestamp DESC
+    )
+    SELECT
+        event_type,
+        flow_id,
+        flow_version,
+        timestamp
+    FROM cte_events
+    LIMIT 1
+"""
+
+_SQL_FLOW_STATE = """
+    SELECT
+        event_type,
+        flow_version
+    FROM v_user_flow_state
+    WHERE user_id = @user_id
+      AND flow_key IN (@flow_id, '*')
+    ORDER BY last_event_at DESC
+    LIMIT 1
+"""
+
+_SQL_HAS_RECENT_FLOW_REQUEST = """
+    SELECT 1
+    FROM app_interactions
+    WHERE user_id = @user_id
+      AND event_type = 'flow_requested'
+      AND JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
+      AND timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @minutes MINUTE)
+    LIMIT 1
+"""
+
+_SQL_EXISTING_GETTING_STARTED_INSTANCE = """
+    SELECT
+        intervention_instance_id
+    FROM intervention_instances_current
+    WHERE user_id = @user_id
+      AND intervention_key = @intervention_key
+      AND status = 'created'
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+_SQL_INTERVENTIONS_FOR_USER = """
+    SELECT
+        intervention_instance_id,
+        user_id,
+        trace_id,
+        metric,
+        level,
+        surface,
+        intervention_key,
+        created_at,
+        scheduled_at,
+        sent_at,
+        status
+    FROM intervention_instances_current
+    WHERE user_id = @user_id
+    AND status = @status
+    ORDER BY created_at DESC
+"""
+
+# Entropy for UUID generation, read from os.urandom in blocks of 256 UUIDs
+# instead of one syscall per uuid4()
+_UUID_BLOCK_SIZE = 16 * 256
+_random_buf = b""
+_random_pos = 0
+_random_lock = threading.Lock()
+
+
+def _user_id_params(user_id: str) -> list:
+    """Query parameters for queries filtered only by @user_id."""
+    return [bigquery.ScalarQueryParameter("user_id", "STRING", user_id)]
+
+
+def _fast_uuid4() -> str:
+    """Return a random (version 4) UUID string drawn from buffered entropy."""
+    global _random_buf, _random_pos
+    with _random_lock:
+        if _random_pos >= len(_random_buf):
+            _random_buf = os.urandom(_UUID_BLOCK_SIZE)
+            _random_pos = 0
+        random_bytes = _random_buf[_random_pos:_random_pos + 16]
+        _random_pos += 16
+    return str(UUID(bytes=random_bytes, version=4))
+
+
+def _intervention_instance_row(
+    user_id: str,
+    metric: str,
+    level: str,
+    surface: str,
+    intervention_key: str,
+    trace_id: str,
+    intervention_instance_id: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+) -> dict:
+    """Build a new intervention_instances row in status "created".
+
+    Args:
+        user_id: User ID
+        metric: Metric name
+        level: Level
+        surface: Surface
+        intervention_key: Intervention key
+        trace_id: Trace ID
+        intervention_instance_id: Instance ID; a random UUID if None
+        created_at: Creation time (default: now); also used as scheduled_at
+    """
+    # Kept as a datetime: the Storage Write path converts it straight to epoch
+    # micros, so no isoformat round trip
+    now = created_at or datetime.now(timezone.utc)
+    return {
+        "intervention_instance_id": intervention_instance_id or _fast_uuid4(),
+        "user_id": user_id,
+        "trace_id": trace_id,
+        "metric": metric,
+        "level": level,
+        "surface": surface,
+        "intervention_key": intervention_key,
+        "created_at": now,
+        "scheduled_at": now,
+        "sent_at": None,
+        "status": "created",
+    }
+
+
+def _logs_errors(action: str):
+    """Decorate a method to log any exception (with traceback) and re-raise it.
+
+    Args:
+        action: What the method does, for the log message (e.g. "querying device token")
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error %s: %s", action, e, exc_info=True)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+def _row_to_dict(row) -> dict:
+    """Copy a BigQuery Row into a column -> value dict.
+
+    Row.items() deep-copies every value, which costs ~10x more than zipping the
+    column names with the row's values (all immutable scalars here).
+    """
+    return dict(zip(row.keys(), row))
+
+
+def _catalog_row_to_dict(row) -> dict:
+    """Convert a catalog Row to a dict, interning its low-cardinality string fields."""
+    intervention = _row_to_dict(row)
+    for field in _CATALOG_INTERNED_FIELDS:
+        value = intervention.get(field)
+        if isinstance(value, str):
+            intervention[field] = sys.intern(value)
+    return intervention
+
+
+def _surface_preferences_from_rows(rows) -> dict[str, dict]:
+    """Build the surface -> preference stats dict from surface_preferences rows.
+
+    Null stats are already defaulted to zero by the queries' COALESCEs.
+
+    Args:
+        rows: BigQuery Rows or STRUCT dicts with surface_preferences columns
+    """
+    return {row["surface"]: {field: row[field] for field in _SURFACE_PREFERENCE_FIELDS} for row in rows}
+
+
+def _get_read_client() -> bigquery_storage_v1.BigQueryReadClient:
+    """Return the process-wide BigQueryReadClient, creating it on first use."""
+    global _read_client
+    if _read_client is None:
+        with _read_client_lock:
+            if _read_client is None:
+                _read_client = bigquery_storage_v1.BigQueryReadClient()
+    return _read_client
+
+
+def _iter_result_rows(results) -> Iterator:
+    """Iterate over query results, using the Storage Read API for large ones.
+
+    Large results arrive as Arrow record batches; each batch is converted
+    column-wise (one to_pylist per column) and zipped into dicts, instead of
+    per-row attribute access. Results of ORDER BY queries are read over a
+    single stream, so their order is kept.
+
+    Args:
+        results: RowIterator from QueryJob.result()
+
+    Yields:
+        Rows supporting item access by column name (Row, or a new dict per row)
+    """
+    if not results.total_rows or results.total_rows <= _STORAGE_READ_MIN_ROWS:
+        yield from results
+        return
+    for batch in results.to_arrow_iterable(bqstorage_client=_get_read_client()):
+        keys = batch.schema.names
+        for values in zip(*(column.to_pylist() for column in batch.columns)):
+            yield dict(zip(keys, values))
+
+
+def _is_flow_completed(row, flow_version: str) -> bool:
+    """Evaluate the latest flow_completed/flow_reset event for a flow.
+
+    Args:
+        row: Row with event_type and flow_version
+        flow_version: Flow version being checked (events without a version count as v1)
+    """
+    if row.event_type == "flow_completed":
+        # Check if flow_version matches
+        return row.flow_version == flow_version or (row.flow_version is None and flow_version == "v1")
+    # Reset found (flow_reset) - flow is not completed
+    return False
+
+
+def _get_gcp_client(project_id: str) -> bigquery.Client:
+    """Return the shared bigquery.Client for a project, creating it on first use."""
+    client = _GCP_CLIENTS.get(project_id)
+    if client is None:
+        with _GCP_CLIENTS_LOCK:
+            client = _GCP_CLIENTS.get(project_id)
+            if client is None:
+                client = bigquery.Client(project=project_id)
+                _GCP_CLIENTS[project_id] = client
+    return client
+
 
 class BigQueryClient:
     """BigQuery client for intervention selector operations."""
@@ -23,8 +511,105 @@ class BigQueryClient:
         """
         self.project_id = project_id
         self.dataset_id = dataset_id
-        self.client = bigquery.Client(project=project_id)
+        self.client = _get_gcp_client(project_id)
+        # Queries use unqualified table names resolved against this dataset, so
+        # the SQL text is identical across calls and environments (cacheable)
+        self._default_dataset = bigquery.DatasetReference(project_id, dataset_id)
+        self._instances_writer: Optional[StorageWriter] = None
+        self._events_writer: Optional[StorageWriter] = None
+        # Writers are created on first use, possibly from QUERY_EXECUTOR threads
+        self._writers_lock = threading.Lock()
+
+    def _job_config(self, query_parameters: list, fast_path: bool = False) -> bigquery.QueryJobConfig:
+        """Build a query job config bound to the default dataset.
+
+        Args:
+            query_parameters: Query parameters
+            fast_path: Config is for a jobs.query (_FAST_QUERY_API) call, which
+                does not accept a priority (it is always interactive)
+        """
+        job_config = bigquery.QueryJobConfig(
+            default_dataset=self._default_dataset,
+            query_parameters=query_parameters,
+            use_query_cache=True,
+            use_legacy_sql=False,
+            job_timeout_ms=_JOB_TIMEOUT_MS,
+        )
+        if not fast_path:
+            job_config.priority = bigquery.QueryPriority.INTERACTIVE
+        return job_config
+
+    def _get_instances_writer(self) -> StorageWriter:
+        """Return the Storage Write API writer for intervention_instances."""
+        if self._instances_writer is None:
+            with self._writers_lock:
+                if self._instances_writer is None:
+                    self._instances_writer = StorageWriter(
+                        self.project_id,
+                        self.dataset_id,
+                        "intervention_instances",
+                        INTERVENTION_INSTANCE_FIELDS,
+                        fallback=self._insert_instance_rows_json,
+                    )
+        return self._instances_writer
+
+    def _insert_instance_rows_json(self, rows) -> None:
+        """Write intervention_instances rows with legacy streaming inserts.
+
+        Rows are sent with insert_rows_json in requests of up to
+        _STREAMING_INSERT_CHUNK rows, several at a time. Instance IDs are sent
+        as insertIds so a retried row is deduplicated.
+
+        Args:
+            rows: Row dicts keyed by column name
 
+        Raises:
+            RuntimeError: If BigQuery rejects any row
+        """
+        table_ref = f"{self.project_id}.{self.dataset_id}.intervention_instances"
+        rows = list(rows)
+        chunks = [rows[i:i + _STREAMING_INSERT_CHUNK] for i in range(0, len(rows), _STREAMING_INSERT_CHUNK)]
+
+        if len(chunks) == 1:
+            errors = self._insert_instance_chunk_json(chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(_STREAMING_INSERT_WORKERS, len(chunks))) as executor:
+                errors = [error for chunk_errors in executor.map(self._insert_instance_chunk_json, chunks) for error in chunk_errors]
+
+        if errors:
+            raise RuntimeError(f"Failed to insert rows into {table_ref}: {errors}")
+
+    def _insert_instance_chunk_json(self, rows: list[dict]) -> list:
+        """Send one insertAll request for intervention_instances rows.
+
+        Args:
+            rows: Row dicts keyed by column name
+
+        Returns:
+            insertErrors reported by BigQuery (empty on success)
+        """
+        table_ref = f"{self.project_id}.{self.dataset_id}.intervention_instances"
+        row_ids = [row["intervention_instance_id"] for row in rows]
+        json_rows = [
+            {column: value.isoformat() if isinstance(value, datetime) else value for column, value in row.items()}
+            for row in rows
+        ]
+        return self.client.insert_rows_json(table_ref, json_rows, row_ids=row_ids)
+
+    def _get_events_writer(self) -> StorageWriter:
+        """Return the Storage Write API writer for intervention_instance_events."""
+        if self._events_writer is None:
+            with self._writers_lock:
+                if self._events_writer is None:
+                    self._events_writer = StorageWriter(
+                        self.project_id,
+                        self.dataset_id,
+                        "intervention_instance_events",
+                        INTERVENTION_INSTANCE_EVENT_FIELDS,
+                    )
+        return self._events_writer
+
+    @_logs_errors("querying state estimates")
     def get_latest_state_estimate(self, user_id: str) -> Optional[dict]:
         """Get the latest state estimate for a user.
 
@@ -34,47 +619,72 @@ class BigQueryClient:
         Returns:
             Dict with state estimate data or None if not found
         """
-        query = f"""
-            SELECT
-                user_id,
-                timestamp,
-                trace_id,
-                recovery,
-                readiness,
-                stress,
-                fatigue
-            FROM `{self.project_id}.{self.dataset_id}.state_estimates`
-            WHERE user_id = @user_id
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """
+        job_config = self._job_config(
+            query_parameters=_user_id_params(user_id),
+            fast_path=True,
+        )
 
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
-            ]
+        query_job = self.client.query(_SQL_LATEST_STATE_ESTIMATE, job_config=job_config, api_method=_FAST_QUERY_API)
+        results = query_job.result(max_results=1, page_size=1)
+
+        row = next(iter(results), None)
+        return None if row is None else _row_to_dict(row)
+
+    def get_user_context(self, user_id: str) -> dict:
+        """Get a user's latest state estimate, device token and surface preferences.
+
+        Runs a single query job instead of one per lookup. If it fails (e.g. the
+        surface_preferences view is missing) the individual getters are run
+        concurrently on QUERY_EXECUTOR, and degrade gracefully on their own.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dict with:
+            - state: state estimate dict (as get_latest_state_estimate) or None
+            - device_token: device token from the devices table or None
+            - preferences: surface preferences (as get_surface_preferences)
+        """
+        job_config = self._job_config(
+            query_parameters=_user_id_params(user_id),
+            fast_path=True,
         )
 
         try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
+            query_job = self.client.query(_SQL_USER_CONTEXT, job_config=job_config, api_method=_FAST_QUERY_API)
+            results = query_job.result(max_results=1, page_size=1)
 
             for row in results:
+                preferences = _surface_preferences_from_rows(row.preferences)
+
+                # Later separate get_device_token/get_surface_preferences calls
+                # for this user are served from the per-user cache
+                with _user_cache_lock:
+                    _user_cache[(self.project_id, self.dataset_id, "device_token", user_id)] = (
+                        row.device_token if row.device_token is not None else _NOT_FOUND
+                    )
+                    _user_cache[(self.project_id, self.dataset_id, "surface_preferences", user_id)] = preferences
+
                 return {
-                    "user_id": row.user_id,
-                    "timestamp": row.timestamp,
-                    "trace_id": row.trace_id,
-                    "recovery": row.recovery,
-                    "readiness": row.readiness,
-                    "stress": row.stress,
-                    "fatigue": row.fatigue,
+                    "state": dict(row.state) if row.state else None,
+                    "device_token": row.device_token,
+                    "preferences": {surface: dict(stats) for surface, stats in preferences.items()},
                 }
-
-            return None
         except Exception as e:
-            logger.error(f"Error querying state estimates: {e}", exc_info=True)
-            raise
-
+            logger.warning("Error querying user context (falling back to separate queries): %s", e)
+
+        # Latency is that of the slowest lookup rather than the sum of all three
+        state = QUERY_EXECUTOR.submit(self.get_latest_state_estimate, user_id)
+        device_token = QUERY_EXECUTOR.submit(self.get_device_token, user_id)
+        preferences = QUERY_EXECUTOR.submit(self.get_surface_preferences, user_id)
+        return {
+            "state": state.result(),
+            "device_token": device_token.result(),
+            "preferences": preferences.result(),
+        }
+
+    @_logs_errors("creating intervention instance")
     def create_intervention_instance(
         self,
         user_id: str,
@@ -83,52 +693,51 @@ class BigQueryClient:
         surface: str,
         intervention_key: str,
         trace_id: str,  # REQUIRED - no longer optional
+        intervention_instance_id: Optional[str] = None,
+        created_at: Optional[datetime] = None,
     ) -> str:
         """Create an intervention instance record in BigQuery.
 
+        The row is appended and acked before the ID is returned, so callers can
+        hand the ID out (e.g. in a push) without racing the insert.
+
         Args:
             user_id: User ID
             metric: Metric name (e.g., "stress")
             level: Level (e.g., "high")
             surface: Surface (e.g., "notification")
             intervention_key: Intervention key
+            intervention_instance_id: Deterministic instance ID (e.g. derived
+                from the triggering message); a random UUID if None
+            created_at: Creation time (default: now); also used as scheduled_at
 
         Returns:
             Intervention instance ID (UUID)
         """
-        intervention_instance_id = str(uuid4())
-        now = datetime.now(timezone.utc)
-
         rows_to_insert = [
-            {
-                "intervention_instance_id": intervention_instance_id,
-                "user_id": user_id,
-                "trace_id": trace_id,
-                "metric": metric,
-                "level": level,
-                "surface": surface,
-                "intervention_key": intervention_key,
-                "created_at": now.isoformat(),
-                "scheduled_at": now.isoformat(),
-                "sent_at": None,
-                "status": "created",
-            }
+            _intervention_instance_row(
+                user_id,
+                metric,
+                level,
+                surface,
+                intervention_key,
+                trace_id,
+                intervention_instance_id,
+                created_at,
+            )
         ]
+        intervention_instance_id = rows_to_insert[0]["intervention_instance_id"]
 
-        table_id = f"{self.project_id}.{self.dataset_id}.intervention_instances"
+        # Storage Write API default stream: rows are committed on ack
+        self._get_instances_writer().append_rows(rows_to_insert)
 
-        try:
-            errors = self.client.insert_rows_json(table_id, rows_to_insert)
-            if errors:
-                logger.error(f"Error inserting intervention instance: {errors}")
-                raise RuntimeError(f"Failed to insert intervention instance: {errors}")
+        with _no_pending_cache_lock:
+            _no_pending_cache.pop((self.project_id, self.dataset_id, user_id), None)
 
-            logger.info(f"Created intervention instance: {intervention_instance_id}")
-            return intervention_instance_id
-        except Exception as e:
-            logger.error(f"Error creating intervention instance: {e}", exc_info=True)
-            raise
+        logger.info("Created intervention instance: %s", intervention_instance_id)
+        return intervention_instance_id
 
+    @_logs_errors("logging intervention instance status change")
     def update_intervention_instance_status(
         self,
         intervention_instance_id: str,
@@ -137,131 +746,154 @@ class BigQueryClient:
     ) -> None:
         """Update intervention instance status.
 
+        The change is appended to intervention_instance_events, which
+        returns as soon as the row is acked instead of waiting on a DML job.
+        Reads go through the intervention_instances_current view, which applies
+        pending events; a scheduled query folds them into intervention_instances.
+
         Args:
             intervention_instance_id: Intervention instance ID
             status: New status ("sent" or "failed")
             sent_at: Timestamp when sent (optional)
         """
-        table_id = f"{self.project_id}.{self.dataset_id}.intervention_instances"
-
-        # Build update query
-        updates = [f"status = @status"]
-        params = [
-            bigquery.ScalarQueryParameter("intervention_instance_id", "STRING", intervention_instance_id),
-            bigquery.ScalarQueryParameter("status", "STRING", status),
-        ]
-
-        if sent_at:
-            updates.append("sent_at = @sent_at")
-            params.append(bigquery.ScalarQueryParameter("sent_at", "TIMESTAMP", sent_at))
-
-        query = f"""
-            UPDATE `{table_id}`
-            SET {', '.join(updates)}
-            WHERE intervention_instance_id = @intervention_instance_id
-        """
-
-        job_config = bigquery.QueryJobConfig(query_parameters=params)
-
-        try:
-            query_job = self.client.query(query, job_config=job_config)
-            query_job.result()  # Wait for completion
-            logger.info(f"Updated intervention instance {intervention_instance_id} to status: {status}")
-        except Exception as e:
-            logger.error(f"Error updating intervention instance status: {e}", exc_info=True)
-            raise
-
+        cache_key = (self.project_id, self.dataset_id, intervention_instance_id)
+        event = {
+            "intervention_instance_id": intervention_instance_id,
+            "status": status,
+            "sent_at": sent_at,
+            "event_time": datetime.now(timezone.utc),
+        }
+        self._get_events_writer().append_rows([event])
+        with _instance_cache_lock:
+            _instance_cache.pop(cache_key, None)
+            _terminal_cache.pop(cache_key, None)
+        logger.info("Logged status change for intervention instance %s: %s", intervention_instance_id, status)
+
+    @_logs_errors("querying intervention instance")
     def get_intervention_instance(self, intervention_instance_id: str) -> Optional[dict]:
         """Get intervention instance by ID.
 
+        Results are cached in-process: 30s for instances that may still change
+        status, 1h once they reach a terminal status (accepted/dismissed/failed).
+
+        intervention_instances and intervention_instance_events are clustered by
+        intervention_instance_id (see terraform), so the lookup through the
+        intervention_instances_current view only reads the matching blocks.
+
         Args:
             intervention_instance_id: Intervention instance ID
 
         Returns:
             Dict with intervention instance data or None if not found
         """
-        query = f"""
-            SELECT
-                intervention_instance_id,
-                user_id,
-                trace_id,
-                metric,
-                level,
-                surface,
-                intervention_key,
-                created_at,
-                scheduled_at,
-                sent_at,
-                status
-            FROM `{self.project_id}.{self.dataset_id}.intervention_instances`
-            WHERE intervention_instance_id = @intervention_instance_id
-            LIMIT 1
-        """
+        cache_key = (self.project_id, self.dataset_id, intervention_instance_id)
+        with _instance_cache_lock:
+            instance = _terminal_cache.get(cache_key) or _instance_cache.get(cache_key)
+        if instance is not None:
+            return instance
 
-        job_config = bigquery.QueryJobConfig(
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("intervention_instance_id", "STRING", intervention_instance_id),
-            ]
+            ],
+            fast_path=True,
         )
 
-        try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            for row in results:
-                return {
-                    "intervention_instance_id": row.intervention_instance_id,
-                    "user_id": row.user_id,
-                    "trace_id": row.trace_id,
-                    "metric": row.metric,
-                    "level": row.level,
-                    "surface": row.surface,
-                    "intervention_key": row.intervention_key,
-                    "created_at": row.created_at,
-                    "scheduled_at": row.scheduled_at,
-                    "sent_at": row.sent_at,
-                    "status": row.status,
-                }
+        query_job = self.client.query(_SQL_INTERVENTION_INSTANCE, job_config=job_config, api_method=_FAST_QUERY_API)
+        results = query_job.result(max_results=1, page_size=1)
 
+        row = next(iter(results), None)
+        if row is None:
             return None
-        except Exception as e:
-            logger.error(f"Error querying intervention instance: {e}", exc_info=True)
-            raise
 
+        instance = _row_to_dict(row)
+        with _instance_cache_lock:
+            if instance["status"] in _TERMINAL_STATUSES:
+                _terminal_cache[cache_key] = instance
+            else:
+                _instance_cache[cache_key] = instance
+        return instance
+
+    @_logs_errors("querying device token")
     def get_device_token(self, user_id: str) -> Optional[str]:
         """Get device token for a user.
 
+        Results (including not found) are cached in-process for 30 seconds.
+
         Args:
             user_id: User ID
 
         Returns:
             Device token or None if not found
         """
-        query = f"""
-            SELECT device_token
-            FROM `{self.project_id}.{self.dataset_id}.devices`
-            WHERE user_id = @user_id
-            ORDER BY updated_at DESC
-            LIMIT 1
+        cache_key = (self.project_id, self.dataset_id, "device_token", user_id)
+        with _user_cache_lock:
+            cached = _user_cache.get(cache_key)
+        if cached is not None:
+            return None if cached is _NOT_FOUND else cached
+
+        job_config = self._job_config(
+            query_parameters=_user_id_params(user_id),
+            fast_path=True,
+        )
+
+        query_job = self.client.query(_SQL_DEVICE_TOKEN, job_config=job_config, api_method=_FAST_QUERY_API)
+        results = query_job.result(max_results=1, page_size=1)
+
+        row = next(iter(results), None)
+        device_token = None if row is None else row.device_token
+
+        with _user_cache_lock:
+            _user_cache[cache_key] = device_token if device_token is not None else _NOT_FOUND
+        return device_token
+
+    def iter_catalog_interventions(self, metric: str, level: str) -> Iterator[dict]:
+        """Iterate over enabled catalog interventions for a given metric and level.
+
+        Results are cached in-process (5 minutes by default, 10 seconds when
+        there are none). Each entry is copied as it is yielded, so consumers
+        that stop early don't pay for copying the rest. The query (on a cache miss) is not
+        issued until the first item is requested.
+
+        Args:
+            metric: Metric name (e.g., "stress")
+            level: Level (e.g., "high", "medium", "low")
+
+        Yields:
+            Intervention dicts with catalog fields
         """
+        cache_key = (self.project_id, self.dataset_id, metric, level)
+        with _catalog_cache_lock:
+            interventions = _catalog_cache.get(cache_key)
+            if interventions is None and cache_key in _catalog_miss_cache:
+                interventions = []
+
+        if interventions is None:
+            job_config = self._job_config(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("metric", "STRING", metric),
+                    bigquery.ScalarQueryParameter("level", "STRING", level),
+                ]
+            )
 
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
-            ]
-        )
+            try:
+                query_job = self.client.query(_SQL_CATALOG_INTERVENTIONS, job_config=job_config)
+                results = query_job.result()
 
-        try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
+                interventions = tuple(_catalog_row_to_dict(row) for row in results)
+            except Exception as e:
+                logger.error("Error querying intervention catalog: %s", e, exc_info=True)
+                raise
 
-            for row in results:
-                return row.device_token
+            with _catalog_cache_lock:
+                if interventions:
+                    _catalog_cache[cache_key] = interventions
+                else:
+                    _catalog_miss_cache[cache_key] = True
 
-            return None
-        except Exception as e:
-            logger.error(f"Error querying device token: {e}", exc_info=True)
-            raise
+        # Copies, so callers can't mutate the cached entries
+        for intervention in interventions:
+            yield dict(intervention)
 
     def get_catalog_interventions(self, metric: str, level: str) -> list[dict]:
         """Get enabled interventions from catalog for a given metric and level.
@@ -273,114 +905,83 @@ class BigQueryClient:
         Returns:
             List of intervention dicts with catalog fields
         """
-        query = f"""
-            SELECT
-                intervention_key,
-                metric,
-                level,
-                target_level,
-                nudge_type,
-                persona,
-                surface,
-                title,
-                body,
-                enabled
-            FROM `{self.project_id}.{self.dataset_id}.intervention_catalog`
-            WHERE enabled = TRUE
-            AND metric = @metric
-            AND level = @level
-            ORDER BY intervention_key
-        """
-
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("metric", "STRING", metric),
-                bigquery.ScalarQueryParameter("level", "STRING", level),
-            ]
-        )
-
-        try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            interventions = []
-            for row in results:
-                interventions.append({
-                    "intervention_key": row.intervention_key,
-                    "metric": row.metric,
-                    "level": row.level,
-                    "target_level": row.target_level,
-                    "nudge_type": row.nudge_type,
-                    "persona": row.persona,
-                    "surface": row.surface,
-                    "title": row.title,
-                    "body": row.body,
-                    "enabled": row.enabled,
-                })
-
-            return interventions
-        except Exception as e:
-            logger.error(f"Error querying intervention catalog: {e}", exc_info=True)
-            raise
+        return list(self.iter_catalog_interventions(metric, level))
 
+    @_logs_errors("querying intervention catalog by key")
     def get_catalog_intervention_by_key(self, intervention_key: str) -> Optional[dict]:
         """Get a single intervention from catalog by intervention_key.
 
+        Found entries are cached in-process (5 minutes by default), unknown keys
+        for 10 seconds.
+
         Args:
             intervention_key: Intervention key
 
         Returns:
             Dict with intervention catalog fields or None if not found
         """
-        query = f"""
-            SELECT
-                intervention_key,
-                metric,
-                level,
-                target_level,
-                nudge_type,
-                persona,
-                surface,
-                title,
-                body,
-                enabled
-            FROM `{self.project_id}.{self.dataset_id}.intervention_catalog`
-            WHERE intervention_key = @intervention_key
-            LIMIT 1
-        """
-
-        job_config = bigquery.QueryJobConfig(
+        cache_key = (self.project_id, self.dataset_id, intervention_key)
+        with _catalog_cache_lock:
+            cached = _catalog_cache.get(cache_key)
+            if cached is None and cache_key in _catalog_miss_cache:
+                return None
+        if cached is not None:
+            return dict(cached)
+
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("intervention_key", "STRING", intervention_key),
-            ]
+            ],
+            fast_path=True,
         )
 
-        try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            for row in results:
-                return {
-                    "intervention_key": row.intervention_key,
-                    "metric": row.metric,
-                    "level": row.level,
-                    "target_level": row.target_level,
-                    "nudge_type": row.nudge_type,
-                    "persona": row.persona,
-                    "surface": row.surface,
-                    "title": row.title,
-                    "body": row.body,
-                    "enabled": row.enabled,
-                }
+        query_job = self.client.query(_SQL_CATALOG_INTERVENTION_BY_KEY, job_config=job_config, api_method=_FAST_QUERY_API)
+        results = query_job.result(max_results=1, page_size=1)
 
+        row = next(iter(results), None)
+        if row is None:
+            with _catalog_cache_lock:
+                _catalog_miss_cache[cache_key] = True
             return None
-        except Exception as e:
-            logger.error(f"Error querying intervention catalog by key: {e}", exc_info=True)
-            raise
+
+        intervention = _row_to_dict(row)
+        with _catalog_cache_lock:
+            _catalog_cache[cache_key] = intervention
+        return dict(intervention)
+
+    @_logs_errors("querying intervention catalog content")
+    def _get_catalog_content(self, refresh: bool = False) -> dict[str, tuple]:
+        """Get (title, body) for every catalog intervention, keyed by intervention_key.
+
+        Cached in-process alongside the other catalog reads, so listing a
+        user's interventions doesn't re-read the catalog table.
+
+        Args:
+            refresh: Re-read the catalog even if a cached index exists (e.g.
+                an instance references an intervention added since it was read)
+
+        Returns:
+            Dict mapping intervention_key -> (title, body)
+        """
+        cache_key = (self.project_id, self.dataset_id)
+        if not refresh:
+            with _catalog_cache_lock:
+                content = _catalog_content_cache.get(cache_key)
+            if content is not None:
+                return content
+
+        query_job = self.client.query(_SQL_CATALOG_CONTENT, job_config=self._job_config(query_parameters=[]))
+        content = {row.intervention_key: (row.title, row.body) for row in query_job.result()}
+
+        with _catalog_cache_lock:
+            _catalog_content_cache[cache_key] = content
+        return content
 
     def get_surface_preferences(self, user_id: str) -> dict[str, dict]:
         """Get surface preferences for a user.
 
+        Results are cached in-process for 30 seconds.
+
         Args:
             user_id: User ID
 
@@ -397,42 +998,28 @@ class BigQueryClient:
                 ...
             }
         """
-        query = f"""
-            SELECT
-                surface,
-                shown_count,
-                preference_score,
-                annoyance_rate,
-                ignore_rate,
-                engagement_rate
-            FROM `{self.project_id}.{self.dataset_id}.surface_preferences`
-            WHERE user_id = @user_id
-        """
-
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
-            ]
+        cache_key = (self.project_id, self.dataset_id, "surface_preferences", user_id)
+        with _user_cache_lock:
+            cached = _user_cache.get(cache_key)
+        if cached is not None:
+            # Copies, so callers can't mutate the cached entries
+            return {surface: dict(stats) for surface, stats in cached.items()}
+
+        job_config = self._job_config(
+            query_parameters=_user_id_params(user_id)
         )
 
         try:
-            query_job = self.client.query(query, job_config=job_config)
+            query_job = self.client.query(_SQL_SURFACE_PREFERENCES, job_config=job_config)
             results = query_job.result()
 
-            preferences = {}
-            for row in results:
-                preferences[row.surface] = {
-                    "preference_score": row.preference_score if row.preference_score is not None else 0.0,
-                    "annoyance_rate": row.annoyance_rate if row.annoyance_rate is not None else 0.0,
-                    "ignore_rate": row.ignore_rate if row.ignore_rate is not None else 0.0,
-                    "shown_count": row.shown_count if row.shown_count is not None else 0,
-                    "engagement_rate": row.engagement_rate if row.engagement_rate is not None else 0.0,
-                }
-
-            return preferences
+            preferences = _surface_preferences_from_rows(results)
+            with _user_cache_lock:
+                _user_cache[cache_key] = preferences
+            return {surface: dict(stats) for surface, stats in preferences.items()}
         except Exception as e:
             # Graceful degradation: if view doesn't exist or query fails, return empty dict
-            logger.warning(f"Error querying surface preferences (returning empty): {e}")
+            logger.warning("Error querying surface preferences (returning empty): %s", e)
             return {}
 
     def has_completed_flow(self, user_id: str, flow_id: str, flow_version: str = "v1") -> bool:
@@ -440,6 +1027,10 @@ class BigQueryClient:
         
         Looks for latest flow_completed event for the flow_id/version, then checks
         if there's a later flow_reset event that would invalidate it.
+
+        Reads the v_user_flow_state materialized view (latest event per
+        user/flow, pre-aggregated), falling back to scanning app_interactions
+        if the view query fails.
         
         Args:
             user_id: User ID
@@ -449,56 +1040,31 @@ class BigQueryClient:
         Returns:
             True if flow is completed (not reset), False otherwise
         """
-        query = f"""
-            WITH cte_events AS (
-                SELECT
-                    event_type,
-                    JSON_EXTRACT_SCALAR(payload, '$.flow_id') AS flow_id,
-                    JSON_EXTRACT_SCALAR(payload, '$.flow_version') AS flow_version,
-                    JSON_EXTRACT_SCALAR(payload, '$.scope') AS scope,
-                    timestamp
-                FROM `{self.project_id}.{self.dataset_id}.app_interactions`
-                WHERE user_id = @user_id
-                  AND event_type IN ('flow_completed', 'flow_reset')
-                  AND (
-                    JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
-                    OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'all'
-                    OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'flows'
-                  )
-                ORDER BY timestamp DESC
-            )
-            SELECT
-                event_type,
-                flow_id,
-                flow_version,
-                timestamp
-            FROM cte_events
-            LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
                 bigquery.ScalarQueryParameter("flow_id", "STRING", flow_id),
-            ]
+            ],
+            fast_path=True,
         )
-        
+
         try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-            
-            for row in results:
-                if row.event_type == "flow_completed":
-                    # Check if flow_version matches
-                    if row.flow_version == flow_version or (row.flow_version is None and flow_version == "v1"):
-                        return True
-                elif row.event_type == "flow_reset":
-                    # Reset found - flow is not completed
-                    return False
-            
-            return False
+            query_job = self.client.query(_SQL_FLOW_STATE, job_config=job_config, api_method=_FAST_QUERY_API)
+            results = query_job.result(max_results=1, page_size=1)
+
+            row = next(iter(results), None)
+            return row is not None and _is_flow_completed(row, flow_version)
         except Exception as e:
-            logger.error(f"Error checking flow completion: {e}", exc_info=True)
+            logger.warning("Error reading v_user_flow_state (falling back to app_interactions): %s", e)
+
+        try:
+            query_job = self.client.query(_SQL_HAS_COMPLETED_FLOW, job_config=job_config, api_method=_FAST_QUERY_API)
+            results = query_job.result(max_results=1, page_size=1)
+
+            row = next(iter(results), None)
+            return row is not None and _is_flow_completed(row, flow_version)
+        except Exception as e:
+            logger.error("Error checking flow completion: %s", e, exc_info=True)
             return False
 
     def has_recent_flow_request(self, user_id: str, flow_id: str, minutes: int = 5) -> bool:
@@ -512,34 +1078,23 @@ class BigQueryClient:
         Returns:
             True if flow_requested event found in last N minutes
         """
-        query = f"""
-            SELECT
-                COUNT(*) as count
-            FROM `{self.project_id}.{self.dataset_id}.app_interactions`
-            WHERE user_id = @user_id
-              AND event_type = 'flow_requested'
-              AND JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
-              AND timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @minutes MINUTE)
-        """
-        
-        job_config = bigquery.QueryJobConfig(
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
                 bigquery.ScalarQueryParameter("flow_id", "STRING", flow_id),
                 bigquery.ScalarQueryParameter("minutes", "INT64", minutes),
-            ]
+            ],
+            fast_path=True,
         )
         
         try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-            
-            for row in results:
-                return row.count > 0
-            
-            return False
+            query_job = self.client.query(_SQL_HAS_RECENT_FLOW_REQUEST, job_config=job_config, api_method=_FAST_QUERY_API)
+            results = query_job.result(max_results=1, page_size=1)
+
+            # Any row means a matching request exists
+            return next(iter(results), None) is not None
         except Exception as e:
-            logger.error(f"Error checking flow request: {e}", exc_info=True)
+            logger.error("Error checking flow request: %s", e, exc_info=True)
             return False
 
     def get_existing_getting_started_instance(self, user_id: str, intervention_key: str) -> Optional[str]:
@@ -555,70 +1110,59 @@ class BigQueryClient:
         Returns:
             Intervention instance ID if exists, None otherwise
         """
-        query = f"""
-            SELECT
-                intervention_instance_id
-            FROM `{self.project_id}.{self.dataset_id}.intervention_instances`
-            WHERE user_id = @user_id
-              AND intervention_key = @intervention_key
-              AND status = 'created'
-            ORDER BY created_at DESC
-            LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
                 bigquery.ScalarQueryParameter("intervention_key", "STRING", intervention_key),
-            ]
+            ],
+            fast_path=True,
         )
         
         try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-            
-            for row in results:
-                return row.intervention_instance_id
-            
-            return None
+            query_job = self.client.query(_SQL_EXISTING_GETTING_STARTED_INSTANCE, job_config=job_config, api_method=_FAST_QUERY_API)
+            results = query_job.result(max_results=1, page_size=1)
+
+            row = next(iter(results), None)
+            return None if row is None else row.intervention_instance_id
         except Exception as e:
-            logger.error(f"Error checking existing getting_started instance: {e}", exc_info=True)
+            logger.error("Error checking existing getting_started instance: %s", e, exc_info=True)
             return None
 
-    def get_interventions_for_user(
+    def iter_interventions_for_user(
         self, user_id: str, status: str = "created"
-    ) -> list[dict]:
-        """Get interventions for a user filtered by status.
+    ) -> Iterator[dict]:
+        """Iterate over a user's interventions filtered by status.
+
+        Rows are yielded as BigQuery pages arrive, so callers can stream
+        results without holding the full list in memory. The query is not
+        issued until the first item is requested.
+
+        Catalog titles and bodies are merged from the cached catalog rather
+        than JOINed in the query.
+
+        The scan is filtered on user_id and status; clustering
+        intervention_instances by (user_id, status) would prune it further, but
+        the table is currently clustered by intervention_instance_id for point
+        lookups.
+
+        Users found with no pending interventions are remembered briefly, and
+        repeat polls for status "created" return nothing without a query.
 
         Args:
             user_id: User ID
             status: Status filter (default: "created" for pending interventions)
 
-        Returns:
-            List of intervention instance dicts with catalog details merged
-        """
-        from src.catalog import get_intervention
-
-        query = f"""
-            SELECT
-                intervention_instance_id,
-                user_id,
-                trace_id,
-                metric,
-                level,
-                surface,
-                intervention_key,
-                created_at,
-                scheduled_at,
-                sent_at,
-                status
-            FROM `{self.project_id}.{self.dataset_id}.intervention_instances`
-            WHERE user_id = @user_id
-            AND status = @status
-            ORDER BY created_at DESC
+        Yields:
+            Intervention instance dicts with catalog details merged
+            (timestamps are datetime objects, serialized by the HTTP handler)
         """
+        no_pending_key = (self.project_id, self.dataset_id, user_id)
+        if status == "created":
+            with _no_pending_cache_lock:
+                if no_pending_key in _no_pending_cache:
+                    return
 
-        job_config = bigquery.QueryJobConfig(
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
                 bigquery.ScalarQueryParameter("status", "STRING", status),
@@ -626,44 +1170,60 @@ class BigQueryClient:
         )
 
         try:
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            interventions = []
-            for row in results:
-                # Get intervention details from catalog
-                intervention = get_intervention(row.intervention_key, self)
-                if not intervention:
-                    logger.warning(f"Intervention not found in catalog: {row.intervention_key}")
+            query_job = self.client.query(_SQL_INTERVENTIONS_FOR_USER, job_config=job_config)
+            results = query_job.result(page_size=_LIST_PAGE_SIZE)
+
+            found = False
+            catalog = None
+            catalog_refreshed = False
+            for row in _iter_result_rows(results):
+                found = True
+                if catalog is None:
+                    catalog = self._get_catalog_content()
+
+                content = catalog.get(row["intervention_key"])
+                if content is None and not catalog_refreshed:
+                    # The cached index may predate a newly added intervention;
+                    # reload it once per call before giving up on the row
+                    catalog = self._get_catalog_content(refresh=True)
+                    catalog_refreshed = True
+                    content = catalog.get(row["intervention_key"])
+                if content is None:
+                    logger.warning("Intervention not found in catalog: %s", row['intervention_key'])
                     continue
 
-                # Merge instance data with catalog details
+                # Merge instance data with catalog details (Arrow rows are
+                # already fresh dicts)
+                intervention = row if isinstance(row, dict) else _row_to_dict(row)
+                intervention["title"], intervention["body"] = content
+
                 # CRITICAL: trace_id is REQUIRED for 100% traceability
-                trace_id = row.trace_id
-                if not trace_id:
-                    trace_id = str(uuid4())
-                    logger.error(f"⚠️ CRITICAL: Missing trace_id in intervention {row.intervention_instance_id}! Generated: {trace_id}")
-                
-                intervention_dict = {
-                    "intervention_instance_id": row.intervention_instance_id,
-                    "user_id": row.user_id,
-                    "trace_id": trace_id,  # REQUIRED - always included
-                    "metric": row.metric,
-                    "level": row.level,
-                    "surface": row.surface,
-                    "intervention_key": row.intervention_key,
-                    "title": intervention["title"],
-                    "body": intervention["body"],
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
-                    "scheduled_at": row.scheduled_at.isoformat() if row.scheduled_at else None,
-                    "sent_at": row.sent_at.isoformat() if row.sent_at else None,
-                    "status": row.status,
-                }
-                interventions.append(intervention_dict)
+                if not intervention["trace_id"]:
+                    intervention["trace_id"] = _fast_uuid4()
+                    logger.error("⚠️ CRITICAL: Missing trace_id in intervention %s! Generated: %s", intervention['intervention_instance_id'], intervention['trace_id'])
 
-            return interventions
+                yield intervention
+
+            if not found and status == "created":
+                with _no_pending_cache_lock:
+                    _no_pending_cache[no_pending_key] = True
         except Exception as e:
-            logger.error(f"Error querying interventions for user: {e}", exc_info=True)
+            logger.error("Error querying interventions for user: %s", e, exc_info=True)
             raise
 
+    def get_interventions_for_user(
+        self, user_id: str, status: str = "created"
+    ) -> list[dict]:
+        """Get interventions for a user filtered by status.
+
+        Args:
+            user_id: User ID
+            status: Status filter (default: "created" for pending interventions)
+
+        Returns:
+            List of intervention instance dicts with catalog details merged
+            (timestamps are datetime objects, serialized by the HTTP handler)
+        """
+        return list(self.iter_interventions_for_user(user_id=user_id, status=status))
+
 
@@ -4,6 +4,9 @@
 STRESS_HIGH_THRESHOLD = 0.7
 STRESS_MEDIUM_THRESHOLD = 0.3
 
+# Indexed by how many thresholds a score clears (>= medium, > high)
+_STRESS_LEVELS = ("low", "medium", "high")
+
 
 def bucket_stress(stress: float | None) -> str | None:
     """Bucket stress score into high, medium, or low.
@@ -17,12 +20,7 @@ def bucket_stress(stress: float | None) -> str | None:
     if stress is None:
         return None
 
-    if stress > STRESS_HIGH_THRESHOLD:
-        return "high"
-    elif stress >= STRESS_MEDIUM_THRESHOLD:
-        return "medium"
-    else:
-        return "low"
+    return _STRESS_LEVELS[(stress >= STRESS_MEDIUM_THRESHOLD) + (stress > STRESS_HIGH_THRESHOLD)]
 
 
 
@@ -0,0 +1,43 @@
+"""Typed Pub/Sub message payloads for intervention selector."""
+
+from typing import Optional, Union
+
+import msgspec
+
+# Fields carried alongside user_id/timestamp by newer state_estimates publishers
+STATE_ESTIMATE_FIELDS = ("trace_id", "recovery", "readiness", "stress", "fatigue")
+
+
+class StateEstimatePayload(msgspec.Struct):
+    """Message published to the state_estimates topic.
+
+    State fields are UNSET when the publisher predates including them, which
+    is distinct from a field that was published as null.
+    """
+
+    user_id: str
+    timestamp: str
+    trace_id: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    recovery: Union[Optional[float], msgspec.UnsetType] = msgspec.UNSET
+    readiness: Union[Optional[float], msgspec.UnsetType] = msgspec.UNSET
+    stress: Union[Optional[float], msgspec.UnsetType] = msgspec.UNSET
+    fatigue: Union[Optional[float], msgspec.UnsetType] = msgspec.UNSET
+
+
+_decoder = msgspec.json.Decoder(StateEstimatePayload)
+
+
+def decode_state_estimate_payload(data: bytes) -> StateEstimatePayload:
+    """Decode and validate a state_estimates message body.
+
+    Args:
+        data: JSON message bytes
+
+    Returns:
+        Decoded payload
+
+    Raises:
+        msgspec.ValidationError: If required fields are missing or mistyped
+        msgspec.DecodeError: If data is not valid JSON
+    """
+    return _decoder.decode(data)
@@ -1,18 +1,56 @@
 """Intervention selection logic with preference-based scoring."""
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
+from src.bigquery_client import QUERY_EXECUTOR
 from src.bucketing import bucket_stress
-from src.catalog import get_interventions_for_state
+from src.catalog import get_intervention, get_interventions_for_state
 
 logger = logging.getLogger(__name__)
 
 
+def _score_surface(surface: str, surface_pref: dict, user_id: str) -> Optional[Tuple[float, float]]:
+    """Score a surface from the user's preference stats.
+
+    Args:
+        surface: Surface name
+        surface_pref: Preference stats for the surface (empty if none)
+        user_id: User ID (for logging)
+
+    Returns:
+        Tuple of (final_score, preference_score), or None if the surface is suppressed
+    """
+    # Suppression rule: if shown_count >= 5 AND capped annoyance_rate > 0.7, suppress.
+    # Most surfaces haven't been shown 5 times, so check that first.
+    shown_count = surface_pref.get("shown_count", 0)
+    if shown_count >= 5:
+        annoyance_rate = surface_pref.get("annoyance_rate", 0.0)
+
+        # Cap annoyance_rate to prevent 100% suppression (allow recovery over time)
+        # Even if user has 100% dismissal rate, cap at 90% for suppression purposes
+        # This ensures surfaces can recover as user preferences evolve
+        annoyance_rate_capped = min(annoyance_rate, 0.9)
+
+        if annoyance_rate_capped > 0.7:
+            logger.info(
+                "Suppressing surface '%s' for user %s: shown_count=%s, annoyance_rate=%s (capped at %s)",
+                surface, user_id, shown_count, annoyance_rate, annoyance_rate_capped,
+            )
+            return None
+
+    preference_score = surface_pref.get("preference_score", 0.0)
+
+    # Calculate final score
+    base_score = 1.0
+    return base_score + preference_score, preference_score
+
+
 def select_intervention(
     state_estimate: dict,
     bq_client,
     user_id: str,
+    surface_prefs: Optional[Dict[str, dict]] = None,
 ) -> Optional[Dict[str, Any]]:
     """Select an intervention based on state estimate and user preferences.
 
@@ -22,6 +60,8 @@ def select_intervention(
             - Other metrics (fatigue, mood) - not used in MVP
         bq_client: BigQueryClient instance
         user_id: User ID for preference lookup
+        surface_prefs: Surface preferences already fetched for the user; looked
+            up from BigQuery if None
 
     Returns:
         Dict with intervention fields:
@@ -32,19 +72,26 @@ def select_intervention(
         - title
         - body
         - nudge_type
+        (the stress-based path returns the full catalog entry, which also
+        carries target_level, persona and enabled)
         Or None if no intervention should be selected
     """
     # Check if getting_started flow is completed
     # If not completed OR user explicitly requested it (About SHIFT), prioritize it
+    flow_requested_future = QUERY_EXECUTOR.submit(
+        bq_client.has_recent_flow_request, user_id, "getting_started", minutes=5
+    )
     getting_started_completed = bq_client.has_completed_flow(user_id, "getting_started", "v1")
-    flow_requested = bq_client.has_recent_flow_request(user_id, "getting_started", minutes=5)
+    flow_requested = flow_requested_future.result()
     
     if not getting_started_completed or flow_requested:
         # Try to get getting_started intervention by key
-        from src.catalog import get_intervention
         getting_started_intervention = get_intervention("getting_started_v1", bq_client)
         if getting_started_intervention:
-            logger.info(f"Selecting getting_started intervention for user {user_id} (completed={getting_started_completed}, requested={flow_requested})")
+            logger.info(
+                "Selecting getting_started intervention for user %s (completed=%s, requested=%s)",
+                user_id, getting_started_completed, flow_requested,
+            )
             return {
                 "intervention_key": "getting_started_v1",
                 "metric": getting_started_intervention.get("metric", "onboarding"),
@@ -55,93 +102,75 @@ def select_intervention(
                 "nudge_type": getting_started_intervention.get("nudge_type", "info"),
             }
         else:
-            logger.warning(f"getting_started_v1 intervention not found in catalog for user {user_id}")
+            logger.warning("getting_started_v1 intervention not found in catalog for user %s", user_id)
     
     # MVP: Only handle stress metric
     metric = "stress"
     stress_score = state_estimate.get("stress")
 
     if stress_score is None:
-        logger.info(f"No stress score in state estimate for user {user_id}")
+        logger.info("No stress score in state estimate for user %s", user_id)
         return None
 
     # Bucket stress score to level
     level = bucket_stress(stress_score)
     if level is None:
-        logger.info(f"Could not bucket stress score {stress_score} for user {user_id}")
+        logger.info("Could not bucket stress score %s for user %s", stress_score, user_id)
         return None
 
-    logger.info(f"Selecting intervention for user {user_id}: metric={metric}, level={level}, stress_score={stress_score}")
+    logger.info(
+        "Selecting intervention for user %s: metric=%s, level=%s, stress_score=%s",
+        user_id, metric, level, stress_score,
+    )
+
+    # Fetch surface preferences while the catalog is read
+    prefs_future = None
+    if surface_prefs is None:
+        prefs_future = QUERY_EXECUTOR.submit(bq_client.get_surface_preferences, user_id)
 
     # Get candidate interventions from catalog
     candidates = get_interventions_for_state(bq_client, metric=metric, level=level)
     if not candidates:
-        logger.warning(f"No interventions found in catalog for metric={metric}, level={level}")
+        logger.warning("No interventions found in catalog for metric=%s, level=%s", metric, level)
         return None
 
-    logger.info(f"Found {len(candidates)} candidate interventions")
+    logger.info("Found %d candidate interventions", len(candidates))
 
     # Get surface preferences for user
-    surface_prefs = bq_client.get_surface_preferences(user_id)
+    if prefs_future is not None:
+        surface_prefs = prefs_future.result()
     if not surface_prefs:
-        logger.info(f"No surface preferences found for user {user_id}, using default scoring")
+        logger.info("No surface preferences found for user %s, using default scoring", user_id)
 
-    # Score and filter candidates
-    scored_candidates = []
+    # Score and filter candidates, keeping the one with the highest final_score
+    # Tie-break by lexicographic intervention_key (deterministic)
+    # Suppression and scores depend only on the surface, and candidates share a
+    # handful of surfaces, so each surface is evaluated once
+    best = None  # ((-final_score, intervention_key), candidate, final_score, preference_score)
+    surface_scores: Dict[str, Optional[Tuple[float, float]]] = {}
     for candidate in candidates:
         surface = candidate["surface"]
-        surface_pref = surface_prefs.get(surface, {})
-
-        # Extract preference stats
-        preference_score = surface_pref.get("preference_score", 0.0)
-        annoyance_rate = surface_pref.get("annoyance_rate", 0.0)
-        shown_count = surface_pref.get("shown_count", 0)
-
-        # Cap annoyance_rate to prevent 100% suppression (allow recovery over time)
-        # Even if user has 100% dismissal rate, cap at 90% for suppression purposes
-        # This ensures surfaces can recover as user preferences evolve
-        annoyance_rate_capped = min(annoyance_rate, 0.9)
-
-        # Suppression rule: if shown_count >= 5 AND capped annoyance_rate > 0.7, suppress
-        if shown_count >= 5 and annoyance_rate_capped > 0.7:
-            logger.info(f"Suppressing surface '{surface}' for user {user_id}: shown_count={shown_count}, annoyance_rate={annoyance_rate} (capped at {annoyance_rate_capped})")
+        if surface not in surface_scores:
+            surface_scores[surface] = _score_surface(surface, surface_prefs.get(surface, {}), user_id)
+        scored = surface_scores[surface]
+        if scored is None:
             continue
+        final_score, preference_score = scored
 
-        # Calculate final score
-        base_score = 1.0
-        final_score = base_score + preference_score
-
-        scored_candidates.append({
-            "candidate": candidate,
-            "final_score": final_score,
-            "surface": surface,
-            "preference_score": preference_score,
-        })
+        rank = (-final_score, candidate["intervention_key"])
+        if best is None or rank < best[0]:
+            best = (rank, candidate, final_score, preference_score)
 
-    if not scored_candidates:
-        logger.warning(f"All candidates suppressed for user {user_id}, metric={metric}, level={level}")
+    if best is None:
+        logger.warning("All candidates suppressed for user %s, metric=%s, level=%s", user_id, metric, level)
         return None
 
-    # Select candidate with highest final_score
-    # Tie-break by lexicographic intervention_key (deterministic)
-    scored_candidates.sort(key=lambda x: (-x["final_score"], x["candidate"]["intervention_key"]))
-    selected = scored_candidates[0]
+    _, selected, final_score, preference_score = best
 
     logger.info(
-        f"Selected intervention for user {user_id}: "
-        f"key={selected['candidate']['intervention_key']}, "
-        f"surface={selected['surface']}, "
-        f"final_score={selected['final_score']:.3f} "
-        f"(preference_score={selected['preference_score']:.3f})"
+        "Selected intervention for user %s: key=%s, surface=%s, final_score=%.3f (preference_score=%.3f)",
+        user_id, selected["intervention_key"], selected["surface"], final_score, preference_score,
     )
 
-    # Return dict matching what main.py expects
-    return {
-        "intervention_key": selected["candidate"]["intervention_key"],
-        "metric": selected["candidate"]["metric"],
-        "level": selected["candidate"]["level"],
-        "surface": selected["candidate"]["surface"],
-        "title": selected["candidate"]["title"],
-        "body": selected["candidate"]["body"],
-        "nudge_type": selected["candidate"]["nudge_type"],
-    }
+    # Catalog entries are per-call copies with every field main.py expects
+    return selected
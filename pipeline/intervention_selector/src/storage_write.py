@@ -0,0 +1,250 @@
+"""BigQuery Storage Write API support for appending rows."""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from google.api_core import exceptions as api_exceptions
+from google.cloud import bigquery_storage_v1
+from google.cloud.bigquery_storage_v1 import exceptions as bqstorage_exceptions
+from google.cloud.bigquery_storage_v1 import types, writer
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+logger = logging.getLogger(__name__)
+
+# (column name, BigQuery type) in table order
+INTERVENTION_INSTANCE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("intervention_instance_id", "STRING"),
+    ("user_id", "STRING"),
+    ("trace_id", "STRING"),
+    ("metric", "STRING"),
+    ("level", "STRING"),
+    ("surface", "STRING"),
+    ("intervention_key", "STRING"),
+    ("created_at", "TIMESTAMP"),
+    ("scheduled_at", "TIMESTAMP"),
+    ("sent_at", "TIMESTAMP"),
+    ("status", "STRING"),
+)
+
+INTERVENTION_INSTANCE_EVENT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("intervention_instance_id", "STRING"),
+    ("status", "STRING"),
+    ("sent_at", "TIMESTAMP"),
+    ("event_time", "TIMESTAMP"),
+)
+
+# TIMESTAMP columns are written as INT64 microseconds since the epoch
+_PROTO_TYPES = {
+    "STRING": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+}
+
+# AppendRows requests are capped at 10MB; leave headroom for the request envelope
+_MAX_REQUEST_BYTES = 9 * 1024 * 1024
+
+# How long appends go straight to the fallback after the API reports Unavailable
+_BREAKER_OPEN_SECONDS = 60
+
+# Epoch and unit for converting TIMESTAMP values to INT64 microseconds
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+_write_client = None
+_write_client_lock = threading.Lock()
+
+
+def _get_write_client() -> bigquery_storage_v1.BigQueryWriteClient:
+    """Return the process-wide BigQueryWriteClient, creating it on first use."""
+    global _write_client
+    if _write_client is None:
+        with _write_client_lock:
+            if _write_client is None:
+                _write_client = bigquery_storage_v1.BigQueryWriteClient()
+    return _write_client
+
+
+def _to_micros(value: Any) -> int:
+    """Convert a datetime or ISO 8601 string to microseconds since the epoch."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    # Integer arithmetic: going through a float timestamp can land a microsecond early
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _build_row_type(name: str, fields: Sequence[Tuple[str, str]]):
+    """Build a proto2 message class and descriptor matching a table schema."""
+    descriptor_proto = descriptor_pb2.DescriptorProto(name=name)
+    for number, (column, bq_type) in enumerate(fields, start=1):
+        descriptor_proto.field.add(
+            name=column,
+            number=number,
+            type=_PROTO_TYPES[bq_type],
+            label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL,
+        )
+
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=f"{name}.proto",
+        package="shift.storage_write",
+        syntax="proto2",
+    )
+    file_proto.message_type.add().CopyFrom(descriptor_proto)
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    row_cls = message_factory.GetMessageClass(
+        pool.FindMessageTypeByName(f"shift.storage_write.{name}")
+    )
+    return row_cls, descriptor_proto
+
+
+class StorageWriter:
+    """Appends rows to a table's _default stream via the Storage Write API.
+
+    Rows on the default stream are committed as soon as the append succeeds,
+    so this is a drop-in replacement for insert_rows_json with gRPC framing
+    and protobuf rows instead of one JSON REST request per insert.
+
+    If a fallback is given, rows the API cannot take because it is Unavailable
+    are handed to it instead, and later appends skip the API for
+    _BREAKER_OPEN_SECONDS before trying it again.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        dataset_id: str,
+        table_id: str,
+        fields: Sequence[Tuple[str, str]],
+        fallback: Optional[Callable[[Sequence[Dict[str, Any]]], None]] = None,
+    ):
+        """Initialize writer.
+
+        Args:
+            project_id: GCP project ID
+            dataset_id: BigQuery dataset ID
+            table_id: BigQuery table ID
+            fields: (column name, BigQuery type) pairs matching the table schema
+            fallback: Called with rows to write another way (e.g. legacy
+                streaming inserts) while the Storage Write API is Unavailable
+        """
+        self.stream_name = (
+            f"projects/{project_id}/datasets/{dataset_id}/tables/{table_id}/streams/_default"
+        )
+        self._fields = tuple(fields)
+        self._timestamp_columns = {column for column, bq_type in self._fields if bq_type == "TIMESTAMP"}
+        self._row_cls, self._descriptor_proto = _build_row_type(table_id, self._fields)
+        self._fallback = fallback
+        self._breaker_open_until = 0.0
+        self._stream = None
+        self._lock = threading.Lock()
+
+    def _open_stream(self) -> writer.AppendRowsStream:
+        """Open an append stream whose template carries the stream name and schema."""
+        proto_data = types.AppendRowsRequest.ProtoData()
+        proto_data.writer_schema = types.ProtoSchema(proto_descriptor=self._descriptor_proto)
+
+        template = types.AppendRowsRequest()
+        template.write_stream = self.stream_name
+        template.proto_rows = proto_data
+
+        return writer.AppendRowsStream(_get_write_client(), template)
+
+    def _encode(self, row: Dict[str, Any]) -> bytes:
+        """Serialize a row dict to the table's protobuf row format."""
+        message = self._row_cls()
+        # Rows often repeat a timestamp across columns (created_at/scheduled_at)
+        last_timestamp, last_micros = None, 0
+        for column, _ in self._fields:
+            value = row.get(column)
+            if value is None:
+                continue
+            if column in self._timestamp_columns:
+                if value != last_timestamp:
+                    last_timestamp, last_micros = value, _to_micros(value)
+                value = last_micros
+            setattr(message, column, value)
+        return message.SerializeToString()
+
+    def _send(self, request: types.AppendRowsRequest):
+        """Send a request on the open stream, reopening it if it was closed."""
+        with self._lock:
+            if self._stream is None:
+                self._stream = self._open_stream()
+            try:
+                return self._stream.send(request)
+            except bqstorage_exceptions.StreamClosedError:
+                logger.info("Append stream closed, reopening: %s", self.stream_name)
+                self._stream = self._open_stream()
+                return self._stream.send(request)
+
+    def _chunks(self, rows: Sequence[Dict[str, Any]]) -> List[Tuple[List[Dict[str, Any]], List[bytes]]]:
+        """Encode rows and split them into groups that fit one AppendRows request."""
+        chunks: List[Tuple[List[Dict[str, Any]], List[bytes]]] = []
+        chunk_rows: List[Dict[str, Any]] = []
+        chunk_encoded: List[bytes] = []
+        size = 0
+        for row in rows:
+            encoded = self._encode(row)
+            if chunk_encoded and size + len(encoded) > _MAX_REQUEST_BYTES:
+                chunks.append((chunk_rows, chunk_encoded))
+                chunk_rows, chunk_encoded, size = [], [], 0
+            chunk_rows.append(row)
+            chunk_encoded.append(encoded)
+            size += len(encoded)
+        if chunk_encoded:
+            chunks.append((chunk_rows, chunk_encoded))
+        return chunks
+
+    def append_rows(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Append rows and wait for the ack, one AppendRows request per 9MB of rows.
+
+        Args:
+            rows: Row dicts keyed by column name
+
+        Raises:
+            RuntimeError: If BigQuery rejects any row
+        """
+        if not rows:
+            return
+
+        if self._fallback is not None and time.monotonic() < self._breaker_open_until:
+            self._fallback(rows)
+            return
+
+        chunks = self._chunks(rows)
+        for index, (chunk_rows, encoded_rows) in enumerate(chunks):
+            request = types.AppendRowsRequest()
+            request.proto_rows = types.AppendRowsRequest.ProtoData(
+                rows=types.ProtoRows(serialized_rows=encoded_rows)
+            )
+
+            try:
+                response = self._send(request).result()
+            except api_exceptions.ServiceUnavailable as e:
+                if self._fallback is None:
+                    raise
+                logger.warning(
+                    "Storage Write API unavailable for %s, using fallback for %ss: %s",
+                    self.stream_name,
+                    _BREAKER_OPEN_SECONDS,
+                    e,
+                )
+                self._breaker_open_until = time.monotonic() + _BREAKER_OPEN_SECONDS
+                self._fallback([row for pending, _ in chunks[index:] for row in pending])
+                return
+
+            if response.row_errors:
+                raise RuntimeError(f"Failed to append rows to {self.stream_name}: {list(response.row_errors)}")
+
+    def close(self) -> None:
+        """Close the underlying append stream, if open."""
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
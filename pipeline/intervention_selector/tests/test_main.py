@@ -0,0 +1,186 @@
+"""Unit tests for intervention selector Cloud Function helpers."""
+
+import base64
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import msgspec
+import pytest
+
+import main
+from main import _PATH_RE, _single_flight, _state_estimate_from_payload
+from src.payloads import decode_state_estimate_payload
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/interventions/abc-123", "abc-123"),
+        ("/abc-123", "abc-123"),
+        ("/interventions/abc-123?user_id=u1", "abc-123"),
+        ("/", ""),
+    ],
+)
+def test_path_re_extracts_intervention_id(path, expected):
+    """Intervention ID is taken from /interventions/{id} or /{id}."""
+    assert _PATH_RE.match(path).group(1) == expected
+
+
+def test_single_flight_shares_result_between_concurrent_callers():
+    """Concurrent callers with the same key run fn once and share its result."""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(_single_flight("key", fn)))
+    leader.start()
+    started.wait(5)
+
+    follower = threading.Thread(target=lambda: results.append(_single_flight("key", fn)))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert calls == [1]
+    assert results == ["result", "result"]
+
+
+def test_single_flight_runs_again_after_completion():
+    """Once a call completes, the next call with the same key runs fn again."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    assert _single_flight("key", fn) == 1
+    assert _single_flight("key", fn) == 2
+
+
+def test_single_flight_propagates_exception():
+    """An exception from fn is raised to the caller and not cached."""
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        _single_flight("key", fail)
+    assert _single_flight("key", lambda: "ok") == "ok"
+
+
+def _cloud_event(message_id: str, data: bytes) -> MagicMock:
+    """Pub/Sub CloudEvent carrying data as its base64 message body."""
+    event = MagicMock()
+    event.__getitem__.side_effect = {"id": message_id}.__getitem__
+    event.get_data.return_value = {"message": {"data": base64.b64encode(data).decode("ascii")}}
+    return event
+
+
+def test_payload_with_state_fields_builds_state_estimate():
+    """A message carrying the state fields yields a full state estimate."""
+    payload = decode_state_estimate_payload(json.dumps({
+        "user_id": "u1",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "trace_id": "t1",
+        "recovery": 0.5,
+        "readiness": 0.6,
+        "stress": 0.8,
+        "fatigue": 0.2,
+    }).encode())
+
+    assert _state_estimate_from_payload(payload) == {
+        "user_id": "u1",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "trace_id": "t1",
+        "recovery": 0.5,
+        "readiness": 0.6,
+        "stress": 0.8,
+        "fatigue": 0.2,
+    }
+
+
+def test_payload_with_null_state_field_keeps_none():
+    """A state field published as null is None, not treated as missing."""
+    payload = decode_state_estimate_payload(json.dumps({
+        "user_id": "u1",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "trace_id": "t1",
+        "recovery": None,
+        "readiness": None,
+        "stress": None,
+        "fatigue": None,
+    }).encode())
+
+    state_estimate = _state_estimate_from_payload(payload)
+
+    assert state_estimate is not None
+    assert state_estimate["stress"] is None
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        {"user_id": "u1", "timestamp": "2025-01-01T00:00:00+00:00"},
+        {"user_id": "u1", "timestamp": "2025-01-01T00:00:00+00:00", "trace_id": "t1", "stress": 0.8},
+    ],
+)
+def test_payload_without_state_fields_has_no_state_estimate(message):
+    """Older messages (user_id + timestamp only, or partial) carry no state estimate."""
+    payload = decode_state_estimate_payload(json.dumps(message).encode())
+
+    assert _state_estimate_from_payload(payload) is None
+
+
+@pytest.mark.parametrize(
+    "data, error",
+    [
+        (b"not json", msgspec.DecodeError),
+        (b'{"timestamp": "2025-01-01T00:00:00+00:00"}', msgspec.ValidationError),
+        (b'{"user_id": "u1", "timestamp": "2025-01-01T00:00:00+00:00", "stress": "high"}', msgspec.ValidationError),
+    ],
+)
+def test_malformed_payload_is_rejected(data, error):
+    """Invalid JSON and missing or mistyped fields fail to decode."""
+    with pytest.raises(error):
+        decode_state_estimate_payload(data)
+
+
+def test_handler_passes_carried_state_estimate():
+    """The Pub/Sub handler processes the state estimate carried in the message."""
+    data = json.dumps({
+        "user_id": "u1",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "trace_id": "t1",
+        "recovery": 0.5,
+        "readiness": 0.6,
+        "stress": 0.8,
+        "fatigue": 0.2,
+    }).encode()
+
+    with patch("main.process_state_estimate") as process:
+        main.intervention_selector(_cloud_event("msg-valid", data))
+
+    kwargs = process.call_args.kwargs
+    assert kwargs["user_id"] == "u1"
+    assert kwargs["message_id"] == "msg-valid"
+    assert kwargs["state_estimate"]["stress"] == 0.8
+
+
+@pytest.mark.parametrize("data", [b"not json", b'{"timestamp": "2025-01-01T00:00:00+00:00"}'])
+def test_handler_drops_malformed_payload(data):
+    """Malformed messages are acknowledged without processing (no retry)."""
+    with patch("main.process_state_estimate") as process:
+        main.intervention_selector(_cloud_event("msg-malformed", data))
+
+    process.assert_not_called()
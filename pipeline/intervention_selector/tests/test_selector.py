@@ -0,0 +1,78 @@
+"""Unit tests for intervention selection."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.selector import select_intervention
+
+
+def _candidate(key, surface):
+    return {
+        "intervention_key": key,
+        "metric": "stress",
+        "level": "high",
+        "surface": surface,
+        "title": key,
+        "body": key,
+        "nudge_type": "info",
+    }
+
+
+@pytest.fixture
+def bq_client():
+    """BigQueryClient mock with getting_started already completed."""
+    client = Mock()
+    client.has_recent_flow_request.return_value = False
+    client.has_completed_flow.return_value = True
+    client.get_surface_preferences.return_value = {}
+    return client
+
+
+def test_selects_highest_scoring_surface(bq_client):
+    """The candidate whose surface has the highest preference score wins."""
+    bq_client.get_catalog_interventions.return_value = [
+        _candidate("a_banner", "notification_banner"),
+        _candidate("b_card", "chat_card"),
+    ]
+    prefs = {
+        "notification_banner": {"preference_score": 0.1},
+        "chat_card": {"preference_score": 0.4},
+    }
+
+    selected = select_intervention({"stress": 0.9}, bq_client, "u1", surface_prefs=prefs)
+
+    assert selected["intervention_key"] == "b_card"
+
+
+def test_ties_break_by_intervention_key(bq_client):
+    """Equal scores are broken by the lexicographically smallest intervention_key."""
+    bq_client.get_catalog_interventions.return_value = [
+        _candidate("b_banner", "notification_banner"),
+        _candidate("a_banner", "notification_banner"),
+    ]
+
+    selected = select_intervention({"stress": 0.9}, bq_client, "u1", surface_prefs={})
+
+    assert selected["intervention_key"] == "a_banner"
+
+
+def test_suppressed_surfaces_are_skipped(bq_client):
+    """Surfaces shown 5+ times with a high annoyance rate are never selected."""
+    bq_client.get_catalog_interventions.return_value = [
+        _candidate("a_banner", "notification_banner"),
+        _candidate("b_card", "chat_card"),
+    ]
+    prefs = {"notification_banner": {"shown_count": 10, "annoyance_rate": 0.9, "preference_score": 1.0}}
+
+    selected = select_intervention({"stress": 0.9}, bq_client, "u1", surface_prefs=prefs)
+
+    assert selected["intervention_key"] == "b_card"
+
+
+def test_all_suppressed_returns_none(bq_client):
+    """No intervention is selected when every candidate's surface is suppressed."""
+    bq_client.get_catalog_interventions.return_value = [_candidate("a_banner", "notification_banner")]
+    prefs = {"notification_banner": {"shown_count": 10, "annoyance_rate": 0.9}}
+
+    assert select_intervention({"stress": 0.9}, bq_client, "u1", surface_prefs=prefs) is None
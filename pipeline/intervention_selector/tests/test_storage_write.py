@@ -0,0 +1,141 @@
+"""Unit tests for the Storage Write API appender."""
+
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+import src.storage_write
+from src.bigquery_client import BigQueryClient
+from src.storage_write import INTERVENTION_INSTANCE_FIELDS, StorageWriter, _to_micros
+
+
+def _writer(fallback=None):
+    """StorageWriter for intervention_instances (no connection is opened until a send)."""
+    return StorageWriter("p", "d", "intervention_instances", INTERVENTION_INSTANCE_FIELDS, fallback=fallback)
+
+
+def _row(i=0):
+    """intervention_instances row dict."""
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return {
+        "intervention_instance_id": f"id-{i}",
+        "user_id": "u1",
+        "trace_id": "t1",
+        "metric": "stress",
+        "level": "high",
+        "surface": "notification_banner",
+        "intervention_key": "stress_high_notification",
+        "created_at": now,
+        "scheduled_at": now,
+        "sent_at": None,
+        "status": "created",
+    }
+
+
+def _ack():
+    """Future for a successful AppendRows response."""
+    future = Future()
+    future.set_result(Mock(row_errors=[]))
+    return future
+
+
+def _unavailable():
+    """Future for an AppendRows call that failed with Unavailable."""
+    future = Future()
+    future.set_exception(api_exceptions.ServiceUnavailable("unavailable"))
+    return future
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (datetime(2025, 1, 1, 0, 0, 0, 1, tzinfo=timezone.utc), 1735689600000001),
+        (datetime(2025, 1, 1, 0, 0, 0, 1), 1735689600000001),
+        ("2025-01-01T00:00:00.000001+00:00", 1735689600000001),
+        # Going through a float timestamp truncates this one to ...286
+        (datetime(2107, 1, 26, 14, 41, 11, 827287, tzinfo=timezone.utc), 4325496071827287),
+    ],
+)
+def test_to_micros(value, expected):
+    """Datetimes (naive = UTC) and ISO strings convert exactly to epoch microseconds."""
+    assert _to_micros(value) == expected
+
+
+def test_rows_are_split_into_requests_under_size_cap(monkeypatch):
+    """Encoded rows are grouped so no AppendRows request exceeds the size cap."""
+    writer = _writer()
+    row_size = len(writer._encode(_row()))
+    monkeypatch.setattr(src.storage_write, "_MAX_REQUEST_BYTES", row_size * 2)
+
+    chunks = writer._chunks([_row(i) for i in range(5)])
+
+    assert [len(encoded) for _, encoded in chunks] == [2, 2, 1]
+    assert [row["intervention_instance_id"] for rows, _ in chunks for row in rows] == [f"id-{i}" for i in range(5)]
+
+
+def test_unavailable_hands_rows_to_fallback_and_opens_breaker():
+    """Unavailable sends the rows to the fallback, which takes later appends too."""
+    fallback = Mock()
+    writer = _writer(fallback=fallback)
+    writer._send = Mock(return_value=_unavailable())
+
+    writer.append_rows([_row(0)])
+    writer.append_rows([_row(1)])
+
+    assert writer._send.call_count == 1
+    assert [call.args[0][0]["intervention_instance_id"] for call in fallback.call_args_list] == ["id-0", "id-1"]
+
+
+def test_breaker_retries_api_after_open_period():
+    """Once the breaker period has passed, appends go to the API again."""
+    fallback = Mock()
+    writer = _writer(fallback=fallback)
+    writer._send = Mock(side_effect=[_unavailable(), _ack()])
+
+    with patch("src.storage_write.time.monotonic", return_value=1000.0):
+        writer.append_rows([_row(0)])
+    with patch("src.storage_write.time.monotonic", return_value=1000.0 + src.storage_write._BREAKER_OPEN_SECONDS):
+        writer.append_rows([_row(1)])
+
+    assert writer._send.call_count == 2
+    assert fallback.call_count == 1
+
+
+def test_unavailable_without_fallback_raises():
+    """Without a fallback, Unavailable is raised to the caller."""
+    writer = _writer()
+    writer._send = Mock(return_value=_unavailable())
+
+    with pytest.raises(api_exceptions.ServiceUnavailable):
+        writer.append_rows([_row()])
+
+
+def test_row_errors_raise():
+    """Rows BigQuery rejects raise a RuntimeError."""
+    writer = _writer()
+    future = Future()
+    future.set_result(Mock(row_errors=["bad row"]))
+    writer._send = Mock(return_value=future)
+
+    with pytest.raises(RuntimeError, match="bad row"):
+        writer.append_rows([_row()])
+
+
+def test_instances_fallback_uses_streaming_inserts():
+    """intervention_instances falls back to insert_rows_json, keyed by instance ID."""
+    with patch("src.bigquery_client._get_gcp_client") as get_gcp_client:
+        bq_client = BigQueryClient(project_id="p", dataset_id="d")
+    bq_client.client = get_gcp_client.return_value
+    bq_client.client.insert_rows_json.return_value = []
+
+    writer = bq_client._get_instances_writer()
+    writer._send = Mock(return_value=_unavailable())
+    writer.append_rows([_row()])
+
+    table_ref, json_rows = bq_client.client.insert_rows_json.call_args.args
+    assert table_ref == "p.d.intervention_instances"
+    assert json_rows[0]["created_at"] == "2025-01-01T00:00:00+00:00"
+    assert bq_client.client.insert_rows_json.call_args.kwargs["row_ids"] == ["id-0"]
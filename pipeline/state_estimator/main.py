@@ -1,11 +1,11 @@
 """Cloud Function entry point for state estimator pipeline."""
 
 import base64
-import json
 import logging
 import os
 from cloudevents.http import CloudEvent
 import functions_framework
+import orjson
 
 from src.repositories.bigquery_repo import BigQueryRepository
 from src.pipeline import run_pipeline
@@ -13,6 +13,21 @@ from src.pipeline import run_pipeline
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Repositories (and their BigQuery clients) are reused across warm invocations
+_repositories = {}
+
+
+def _get_repository(project_id: str, dataset_id: str) -> BigQueryRepository:
+    """Return the BigQueryRepository for a project/dataset, creating it on first use."""
+    key = (project_id, dataset_id)
+    repository = _repositories.get(key)
+    if repository is None:
+        repository = _repositories[key] = BigQueryRepository(
+            project_id=project_id,
+            dataset_id=dataset_id,
+        )
+    return repository
+
 
 @functions_framework.cloud_event
 def state_estimator(cloud_event: CloudEvent):
@@ -27,12 +42,13 @@ def state_estimator(cloud_event: CloudEvent):
         message_data = cloud_event.get_data()
         if message_data:
             if isinstance(message_data, bytes):
-                decoded_data = base64.b64decode(message_data).decode("utf-8")
+                raw_data = base64.b64decode(message_data)
                 try:
-                    payload = json.loads(decoded_data)
+                    # orjson parses bytes, so there's no separate UTF-8 decode
+                    payload = orjson.loads(raw_data)
                     logger.info(f"Received Pub/Sub message: {payload}")
-                except json.JSONDecodeError:
-                    logger.info(f"Received Pub/Sub message (non-JSON): {decoded_data}")
+                except ValueError:
+                    logger.info(f"Received Pub/Sub message (non-JSON): {raw_data.decode('utf-8', errors='replace')}")
             elif isinstance(message_data, dict):
                 logger.info(f"Received Pub/Sub message: {message_data}")
         
@@ -42,10 +58,7 @@ def state_estimator(cloud_event: CloudEvent):
             raise ValueError("GCP_PROJECT_ID environment variable not set")
         
         dataset_id = os.getenv("BQ_DATASET_ID", "shift_data")
-        repository = BigQueryRepository(
-            project_id=project_id,
-            dataset_id=dataset_id,
-        )
+        repository = _get_repository(project_id, dataset_id)
         
         # Run pipeline (processes all unprocessed records)
         logger.info("Starting state estimator pipeline...")
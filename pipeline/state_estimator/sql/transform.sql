@@ -1,15 +1,9 @@
 -- Transform: Calculate state estimates from unprocessed inputs
--- This reads from the unprocessed view and inserts results into state_estimates table
+-- This reads from the unprocessed view and inserts results into state_estimates table.
+-- The script's final SELECT returns the latest new estimate per user, which is what
+-- gets published to Pub/Sub, so the publisher doesn't have to query state_estimates again.
 
-INSERT INTO shift_data.state_estimates (
-    user_id,
-    timestamp,
-    trace_id,
-    recovery,
-    readiness,
-    stress,
-    fatigue
-)
+CREATE TEMP TABLE new_state_estimates AS
 WITH cte_unprocessed AS (
     SELECT
         user_id,
@@ -92,5 +86,39 @@ SELECT
     readiness,
     stress,
     fatigue
-FROM cte_state_scores
+FROM cte_state_scores;
+
+INSERT INTO shift_data.state_estimates (
+    user_id,
+    timestamp,
+    trace_id,
+    recovery,
+    readiness,
+    stress,
+    fatigue
+)
+SELECT
+    user_id,
+    timestamp,
+    trace_id,
+    recovery,
+    readiness,
+    stress,
+    fatigue
+FROM new_state_estimates;
 
+WITH cte_latest_per_user AS (
+    SELECT
+        user_id,
+        timestamp,
+        trace_id,
+        recovery,
+        readiness,
+        stress,
+        fatigue,
+        ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY timestamp DESC) AS rn
+    FROM new_state_estimates
+)
+SELECT user_id, timestamp, trace_id, recovery, readiness, stress, fatigue
+FROM cte_latest_per_user
+WHERE rn = 1;
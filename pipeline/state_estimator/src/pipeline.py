@@ -1,19 +1,61 @@
 """Pipeline execution logic for state estimator."""
 
-import json
 import logging
 import os
+import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Pub/Sub client-side batching: messages are sent together once 100 are
+# pending or 50ms after the first, instead of one publish RPC per message
+_PUBLISH_MAX_MESSAGES = 100
+_PUBLISH_MAX_LATENCY_SECONDS = 0.05
+_PUBLISH_MAX_BYTES = 1_000_000
+_PUBLISH_TIMEOUT_SECONDS = 30
+
+# Reused across warm invocations so gRPC channel setup is paid once per instance
+_publisher = None
+_publisher_lock = threading.Lock()
+_topic_paths: dict = {}
+
+
+def _get_publisher():
+    """Return the process-wide Pub/Sub PublisherClient, creating it on first use."""
+    global _publisher
+    if _publisher is None:
+        with _publisher_lock:
+            if _publisher is None:
+                from google.cloud import pubsub_v1
+
+                _publisher = pubsub_v1.PublisherClient(
+                    batch_settings=pubsub_v1.types.BatchSettings(
+                        max_messages=_PUBLISH_MAX_MESSAGES,
+                        max_latency=_PUBLISH_MAX_LATENCY_SECONDS,
+                        max_bytes=_PUBLISH_MAX_BYTES,
+                    )
+                )
+    return _publisher
+
+
+def _get_topic_path(project_id: str, topic_name: str) -> str:
+    """Return the fully qualified topic path, memoized per (project, topic)."""
+    key = (project_id, topic_name)
+    topic_path = _topic_paths.get(key)
+    if topic_path is None:
+        topic_path = _topic_paths[key] = _get_publisher().topic_path(project_id, topic_name)
+    return topic_path
+
 
 def publish_state_estimates(
     repository,
     project_id: str,
     topic_name: str = "state_estimates",
     verbose: bool = True,
+    estimates=None,
 ):
     """Publish newly created state estimates to Pub/Sub.
 
@@ -22,61 +64,96 @@ def publish_state_estimates(
         project_id: GCP project ID
         topic_name: Pub/Sub topic name (default: state_estimates)
         verbose: Whether to print progress
+        estimates: Latest new estimate per user, as returned by the transform
+            script. If None, they are queried from state_estimates instead.
     """
     try:
-        from google.cloud import pubsub_v1
-
-        publisher = pubsub_v1.PublisherClient()
-        topic_path = publisher.topic_path(project_id, topic_name)
+        if estimates is not None:
+            # Materializing may fetch further result pages, so it's covered by
+            # the same don't-fail-the-pipeline handling as publishing
+            estimates = list(estimates)
+            if not estimates:
+                # The transform inserted nothing; don't touch Pub/Sub at all
+                if verbose:
+                    logger.info("[State Estimator] No new state estimates to publish")
+                return
+
+        publisher = _get_publisher()
+        topic_path = _get_topic_path(project_id, topic_name)
+
+        if estimates is not None:
+            results = estimates
+        else:
+            if verbose:
+                logger.info("[State Estimator] Querying newly created state estimates...")
+
+            # Query for the latest state estimate per user created in the last 5 minutes
+            # This captures newly created estimates from the transform
+            query = """
+                WITH cte_latest_per_user AS (
+                    SELECT
+                        user_id,
+                        timestamp,
+                        trace_id,
+                        recovery,
+                        readiness,
+                        stress,
+                        fatigue,
+                        ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY timestamp DESC) as rn
+                    FROM `{project_id}.shift_data.state_estimates`
+                    WHERE timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 5 MINUTE)
+                )
+                SELECT user_id, timestamp, trace_id, recovery, readiness, stress, fatigue
+                FROM cte_latest_per_user
+                WHERE rn = 1
+            """.format(project_id=project_id)
 
-        if verbose:
-            logger.info(f"[State Estimator] Querying newly created state estimates...")
-
-        # Query for the latest state estimate per user created in the last 5 minutes
-        # This captures newly created estimates from the transform
-        query = """
-            WITH cte_latest_per_user AS (
-                SELECT
-                    user_id,
-                    timestamp,
-                    ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY timestamp DESC) as rn
-                FROM `{project_id}.shift_data.state_estimates`
-                WHERE timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 5 MINUTE)
-            )
-            SELECT user_id, timestamp
-            FROM cte_latest_per_user
-            WHERE rn = 1
-        """.format(project_id=project_id)
-
-        results = repository.execute_query(query, verbose=False)
+            results = repository.execute_query(query, verbose=False)
 
-        published_count = 0
+        # Publish every row before waiting so the messages share batches
+        pending = []
         for row in results:
             user_id = row.user_id
             timestamp = row.timestamp
 
-            # Publish message with user_id and timestamp
+            # Publish the full state estimate so the intervention selector
+            # doesn't have to read it back from BigQuery
             message_data = {
                 "user_id": user_id,
                 "timestamp": timestamp.isoformat(),
+                "trace_id": row.trace_id,
+                "recovery": row.recovery,
+                "readiness": row.readiness,
+                "stress": row.stress,
+                "fatigue": row.fatigue,
             }
-            data = json.dumps(message_data).encode("utf-8")
+            data = orjson.dumps(message_data)
 
-            future = publisher.publish(topic_path, data)
-            message_id = future.result()
+            pending.append((user_id, timestamp, publisher.publish(topic_path, data)))
+
+        published_count = 0
+        for user_id, timestamp, future in pending:
+            try:
+                message_id = future.result(timeout=_PUBLISH_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.warning(
+                    "[State Estimator] Failed to publish state estimate for user %s at %s: %s", user_id, timestamp, e
+                )
+                continue
 
             if verbose:
                 logger.info(
-                    f"[State Estimator] Published state estimate for user {user_id} at {timestamp} (message_id: {message_id})"
+                    "[State Estimator] Published state estimate for user %s at %s (message_id: %s)",
+                    user_id, timestamp, message_id,
                 )
             published_count += 1
 
         if verbose:
-            logger.info(f"[State Estimator] Published {published_count} state estimate(s) to Pub/Sub")
+            logger.info("[State Estimator] Published %d state estimate(s) to Pub/Sub", published_count)
 
     except Exception as e:
         # Log error but don't fail the pipeline
-        logger.warning(f"[State Estimator] Failed to publish state estimates to Pub/Sub: {e}")
+        logger.warning("[State Estimator] Failed to publish state estimates to Pub/Sub: %s", e)
 
 
 def run_pipeline(
@@ -110,7 +187,7 @@ def run_pipeline(
         if verbose:
             logger.info("[State Estimator] Running transformation...")
         transform_path = sql_dir / "transform.sql"
-        repository.execute_script(transform_path, verbose=verbose)
+        new_estimates = repository.execute_script(transform_path, verbose=verbose)
         if verbose:
             logger.info("[State Estimator] Transformation completed successfully")
 
@@ -118,7 +195,7 @@ def run_pipeline(
         if publish_results:
             project_id = os.getenv("GCP_PROJECT_ID")
             if project_id:
-                publish_state_estimates(repository, project_id, verbose=verbose)
+                publish_state_estimates(repository, project_id, verbose=verbose, estimates=new_estimates)
             elif verbose:
                 logger.warning("[State Estimator] GCP_PROJECT_ID not set, skipping Pub/Sub publish")
 
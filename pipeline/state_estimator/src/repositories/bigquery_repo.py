@@ -1,6 +1,7 @@
 """BigQuery repository implementation."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +10,16 @@ from google.cloud import bigquery
 from src.repository import Repository
 
 
+@lru_cache(maxsize=16)
+def _read_sql(sql_path: Path) -> str:
+    """Read a SQL file, cached so warm invocations don't re-read it.
+
+    The SQL files ship with the function and don't change at runtime.
+    """
+    with open(sql_path, "r") as f:
+        return f.read()
+
+
 class BigQueryRepository:
     """BigQuery implementation of Repository interface."""
 
@@ -39,12 +50,15 @@ class BigQueryRepository:
         query_job = self.client.query(query)
         return query_job.result()  # Waits for job to complete
 
-    def execute_script(self, sql_file_path: str | Path, verbose: bool = True) -> None:
+    def execute_script(self, sql_file_path: str | Path, verbose: bool = True) -> Any:
         """Execute a SQL script from a file.
 
         Args:
             sql_file_path: Path to SQL file
             verbose: Whether to print progress
+
+        Returns:
+            Results of the script's last statement
         """
         sql_path = Path(sql_file_path)
         if not sql_path.is_absolute():
@@ -58,9 +72,8 @@ class BigQueryRepository:
             print(f"[BigQuery] Executing script: {sql_path}")
 
         try:
-            with open(sql_path, "r") as f:
-                sql_text = f.read()
-                self.execute_query(sql_text, verbose=verbose)
+            sql_text = _read_sql(sql_path)
+            return self.execute_query(sql_text, verbose=verbose)
         except FileNotFoundError:
             raise FileNotFoundError(f"SQL file not found: {sql_path}")
         except Exception as e:
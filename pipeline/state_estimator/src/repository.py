@@ -11,7 +11,7 @@ class Repository(Protocol):
         """Execute a SQL query and return results."""
         ...
 
-    def execute_script(self, sql_file_path: str | Path) -> None:
-        """Execute a SQL script from a file."""
+    def execute_script(self, sql_file_path: str | Path) -> Any:
+        """Execute a SQL script from a file and return its last statement's results."""
         ...
 
@@ -4,9 +4,20 @@ import pytest
 from unittest.mock import Mock
 from pathlib import Path
 
+import src.pipeline
 from src.repository import Repository
 
 
+@pytest.fixture(autouse=True)
+def reset_publisher():
+    """Drop the cached Pub/Sub publisher so each test sees its own mock."""
+    src.pipeline._publisher = None
+    src.pipeline._topic_paths.clear()
+    yield
+    src.pipeline._publisher = None
+    src.pipeline._topic_paths.clear()
+
+
 @pytest.fixture
 def mock_repository():
     """Create a mocked repository for testing."""
@@ -4,11 +4,21 @@ import base64
 import json
 import os
 from unittest.mock import Mock, patch, MagicMock
+import pytest
 from cloudevents.http import CloudEvent
 
+import main
 from main import state_estimator
 
 
+@pytest.fixture(autouse=True)
+def reset_repositories():
+    """Drop cached repositories so each test sees its own mocked BigQueryRepository."""
+    main._repositories.clear()
+    yield
+    main._repositories.clear()
+
+
 def test_state_estimator_with_valid_pubsub_message():
     """Test Cloud Function handler with valid Pub/Sub message."""
     # Create mock CloudEvent with Pub/Sub message data
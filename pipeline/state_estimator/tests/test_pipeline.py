@@ -1,9 +1,11 @@
 """Unit tests for state estimator pipeline."""
 
+import json
+from datetime import datetime, timezone
 from pathlib import Path
-from unittest.mock import Mock, call
+from unittest.mock import Mock, call, patch
 
-from src.pipeline import run_pipeline
+from src.pipeline import publish_state_estimates, run_pipeline
 
 
 def test_run_pipeline_executes_views_and_transform(mock_repository, tmp_path):
@@ -72,3 +74,87 @@ def test_run_pipeline_skips_transform_when_requested(mock_repository):
     transform_calls = [c for c in mock_repository.execute_script.call_args_list 
                       if c[0][0] == transform_path]
     assert len(transform_calls) == 0, "Transform should not be executed when skipped"
+
+
+def test_publish_state_estimates_includes_state_fields(mock_repository):
+    """Test that published messages carry the full state estimate."""
+    row = Mock(
+        user_id="test-user",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        trace_id="trace-123",
+        recovery=0.5,
+        readiness=0.6,
+        stress=0.8,
+        fatigue=0.2,
+    )
+    mock_repository.execute_query.return_value = [row]
+
+    with patch("src.pipeline._get_publisher") as mock_get_publisher:
+        mock_publisher = mock_get_publisher.return_value
+        mock_publisher.topic_path.return_value = "projects/test-project/topics/state_estimates"
+
+        publish_state_estimates(mock_repository, "test-project", verbose=False)
+
+    data = mock_publisher.publish.call_args[0][1]
+    assert json.loads(data) == {
+        "user_id": "test-user",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "trace_id": "trace-123",
+        "recovery": 0.5,
+        "readiness": 0.6,
+        "stress": 0.8,
+        "fatigue": 0.2,
+    }
+
+
+def test_run_pipeline_publishes_transform_results(mock_repository, monkeypatch):
+    """Test that estimates returned by the transform are published without re-querying."""
+    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
+    row = Mock(
+        user_id="test-user",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        trace_id="trace-123",
+        recovery=0.5,
+        readiness=0.6,
+        stress=0.8,
+        fatigue=0.2,
+    )
+    mock_repository.execute_script.return_value = [row]
+
+    with patch("src.pipeline._get_publisher") as mock_get_publisher:
+        mock_publisher = mock_get_publisher.return_value
+        mock_publisher.topic_path.return_value = "projects/test-project/topics/state_estimates"
+
+        run_pipeline(mock_repository, create_views=False, verbose=False)
+
+    mock_repository.execute_query.assert_not_called()
+    assert mock_publisher.publish.call_count == 1
+    assert json.loads(mock_publisher.publish.call_args[0][1])["user_id"] == "test-user"
+
+
+def test_run_pipeline_skips_publish_when_transform_inserts_nothing(mock_repository, monkeypatch):
+    """Test that an empty transform result doesn't create a publisher or re-query."""
+    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
+    mock_repository.execute_script.return_value = []
+
+    with patch("src.pipeline._get_publisher") as mock_get_publisher:
+        run_pipeline(mock_repository, create_views=False, verbose=False)
+
+    mock_get_publisher.assert_not_called()
+    mock_repository.execute_query.assert_not_called()
+
+
+def test_run_pipeline_tolerates_failure_reading_transform_results(mock_repository, monkeypatch):
+    """Test that an error fetching transform result pages doesn't fail the pipeline."""
+    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
+
+    def failing_rows():
+        raise RuntimeError("page fetch failed")
+        yield
+
+    mock_repository.execute_script.return_value = failing_rows()
+
+    with patch("src.pipeline._get_publisher") as mock_get_publisher:
+        run_pipeline(mock_repository, create_views=False, verbose=False)
+
+    mock_get_publisher.return_value.publish.assert_not_called()
@@ -4,9 +4,147 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import os
+import threading
 
+import cachetools
 from google.cloud import bigquery
 
+# SQL for ContextRepository queries. Table names are unqualified and resolved
+# against the job's default dataset.
+
+_SQL_LATEST_STATE_ESTIMATE = """
+    SELECT
+        user_id,
+        timestamp,
+        trace_id,
+        recovery,
+        readiness,
+        stress,
+        fatigue
+    FROM state_estimates
+    WHERE user_id = @user_id
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+
+_SQL_CREATED_INTERVENTIONS = """
+    SELECT
+        intervention_instance_id,
+        user_id,
+        trace_id,
+        metric,
+        level,
+        surface,
+        intervention_key,
+        created_at,
+        scheduled_at,
+        sent_at,
+        status
+    FROM intervention_instances_current
+    WHERE user_id = @user_id
+      AND status = 'created'
+    ORDER BY created_at DESC
+"""
+
+_SQL_CATALOG = """
+    SELECT
+        intervention_key,
+        metric,
+        level,
+        target_level,
+        nudge_type,
+        persona,
+        surface,
+        title,
+        body,
+        enabled
+    FROM intervention_catalog
+"""
+
+_SQL_LATEST_FLOW_EVENT = """
+    WITH cte_events AS (
+        SELECT
+            event_type,
+            JSON_EXTRACT_SCALAR(payload, '$.flow_id') AS flow_id,
+            JSON_EXTRACT_SCALAR(payload, '$.flow_version') AS flow_version,
+            JSON_EXTRACT_SCALAR(payload, '$.scope') AS scope,
+            timestamp
+        FROM app_interactions
+        WHERE user_id = @user_id
+          AND event_type IN ('flow_completed', 'flow_reset')
+          AND (
+            JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
+            OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'all'
+            OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'flows'
+          )
+        ORDER BY timestamp DESC
+    )
+    SELECT
+        event_type,
+        flow_id,
+        flow_version,
+        timestamp
+    FROM cte_events
+    LIMIT 1
+"""
+
+_SQL_RECENT_FLOW_REQUEST = """
+    SELECT 1
+    FROM app_interactions
+    WHERE user_id = @user_id
+      AND event_type = 'flow_requested'
+      AND JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
+      AND timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @minutes MINUTE)
+    LIMIT 1
+"""
+
+# These are small interactive lookups, so they go through query_and_wait,
+# which calls jobs.query and returns results in the same round trip instead of
+# jobs.insert followed by polling. With optional job creation (short query
+# optimized mode, only sent by query_and_wait) BigQuery also skips creating a
+# job resource when it can.
+_JOB_CREATION_MODE = bigquery.enums.JobCreationMode.JOB_CREATION_OPTIONAL
+
+# One client per project for the whole process, so requests reuse its
+# credentials and HTTP connection pool instead of setting up new ones.
+_clients: Dict[str, bigquery.Client] = {}
+_clients_lock = threading.Lock()
+
+# Whole intervention_catalog snapshots keyed by (project, dataset). The catalog
+# is small reference data that rarely changes, so /context serves it from
+# memory and reloads it at most every five minutes.
+_catalog_cache = cachetools.TTLCache(maxsize=8, ttl=300)
+_catalog_cache_lock = threading.Lock()
+
+# Latest state estimate per (project, dataset, user_id). Estimates arrive far
+# less often than the app polls /context, so a few seconds of staleness absorbs
+# repeat polls. Users without an estimate are cached too (_NO_ESTIMATE).
+_state_cache = cachetools.TTLCache(maxsize=10_000, ttl=15)
+_state_cache_lock = threading.Lock()
+_NO_ESTIMATE = object()
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    """Copy a BigQuery Row into a column -> value dict.
+
+    The queries select exactly the columns callers expect as keys. Zipping the
+    column names with the row's values avoids Row.items(), which deep-copies
+    every value, and a per-column attribute lookup.
+    """
+    return dict(zip(row.keys(), row))
+
+
+def get_bigquery_client(project_id: str) -> bigquery.Client:
+    """Return the process-wide BigQuery client for a project, creating it on first use."""
+    client = _clients.get(project_id)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(project_id)
+            if client is None:
+                client = bigquery.Client(project=project_id, default_job_creation_mode=_JOB_CREATION_MODE)
+                _clients[project_id] = client
+    return client
+
 
 class ContextRepository:
     """Repository for fetching state and interventions for the context payload.
@@ -17,148 +155,95 @@ class ContextRepository:
     def __init__(self, project_id: str, dataset_id: str = "shift_data") -> None:
         self.project_id = project_id
         self.dataset_id = dataset_id
-        self.client = bigquery.Client(project=project_id)
+        self.client = get_bigquery_client(project_id)
+        self._default_dataset = bigquery.DatasetReference(project_id, dataset_id)
+
+    def _job_config(self, query_parameters: list) -> bigquery.QueryJobConfig:
+        """Build a query job config bound to the repository's dataset."""
+        return bigquery.QueryJobConfig(
+            default_dataset=self._default_dataset,
+            query_parameters=query_parameters,
+        )
 
     def get_latest_state_estimate(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch the latest state_estimates row for a user."""
-        query = f"""
-            SELECT
-                user_id,
-                timestamp,
-                trace_id,
-                recovery,
-                readiness,
-                stress,
-                fatigue
-            FROM `{self.project_id}.{self.dataset_id}.state_estimates`
-            WHERE user_id = @user_id
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """
+        """Fetch the latest state_estimates row for a user (cached for 15 seconds)."""
+        cache_key = (self.project_id, self.dataset_id, user_id)
+        with _state_cache_lock:
+            cached = _state_cache.get(cache_key)
+        if cached is not None:
+            return None if cached is _NO_ESTIMATE else cached
 
-        job_config = bigquery.QueryJobConfig(
+        state_estimate = self._query_latest_state_estimate(user_id)
+        with _state_cache_lock:
+            _state_cache[cache_key] = _NO_ESTIMATE if state_estimate is None else state_estimate
+        return state_estimate
+
+    def _query_latest_state_estimate(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Query the latest state_estimates row for a user."""
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
             ]
         )
 
-        query_job = self.client.query(query, job_config=job_config)
-        results = query_job.result()
+        results = self.client.query_and_wait(_SQL_LATEST_STATE_ESTIMATE, job_config=job_config)
 
         for row in results:
-            return {
-                "user_id": row.user_id,
-                "timestamp": row.timestamp,
-                "trace_id": row.trace_id,
-                "recovery": row.recovery,
-                "readiness": row.readiness,
-                "stress": row.stress,
-                "fatigue": row.fatigue,
-            }
+            return _row_to_dict(row)
 
         return None
 
     def get_created_interventions_for_user(self, user_id: str) -> List[Dict[str, Any]]:
-        """Fetch all intervention_instances with status='created' for a user."""
-        query = f"""
-            SELECT
-                intervention_instance_id,
-                user_id,
-                trace_id,
-                metric,
-                level,
-                surface,
-                intervention_key,
-                created_at,
-                scheduled_at,
-                sent_at,
-                status
-            FROM `{self.project_id}.{self.dataset_id}.intervention_instances`
-            WHERE user_id = @user_id
-              AND status = 'created'
-            ORDER BY created_at DESC
-        """
+        """Fetch a user's intervention instances still in status 'created'.
 
-        job_config = bigquery.QueryJobConfig(
+        Reads intervention_instances_current, so instances the selector has
+        already marked sent or failed are excluded before the events are folded.
+        """
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
             ]
         )
 
-        query_job = self.client.query(query, job_config=job_config)
-        results = query_job.result()
+        results = self.client.query_and_wait(_SQL_CREATED_INTERVENTIONS, job_config=job_config)
 
-        interventions: List[Dict[str, Any]] = []
-        for row in results:
-            interventions.append(
-                {
-                    "intervention_instance_id": row.intervention_instance_id,
-                    "user_id": row.user_id,
-                    "trace_id": row.trace_id,
-                    "metric": row.metric,
-                    "level": row.level,
-                    "surface": row.surface,
-                    "intervention_key": row.intervention_key,
-                    "created_at": row.created_at,
-                    "scheduled_at": row.scheduled_at,
-                    "sent_at": row.sent_at,
-                    "status": row.status,
-                }
-            )
+        interventions = [_row_to_dict(row) for row in results]
 
         return interventions
 
     def get_catalog_for_keys(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
         """Fetch intervention_catalog rows for the given intervention keys.
 
+        Served from an in-process snapshot of the whole catalog (see
+        _get_catalog), so this normally doesn't query BigQuery.
+
         Returns a mapping of intervention_key -> catalog row.
         """
         if not keys:
             return {}
 
-        table = f"{self.project_id}.{self.dataset_id}.intervention_catalog"
-
-        query = f"""
-            SELECT
-                intervention_key,
-                metric,
-                level,
-                target_level,
-                nudge_type,
-                persona,
-                surface,
-                title,
-                body,
-                enabled
-            FROM `{table}`
-            WHERE intervention_key IN UNNEST(@keys)
+        catalog = self._get_catalog()
+        return {key: catalog[key] for key in keys if key in catalog}
+
+    def _get_catalog(self) -> Dict[str, Dict[str, Any]]:
+        """Return every intervention_catalog row keyed by intervention_key.
+
+        The catalog is a small reference table, so it is loaded whole and
+        cached for five minutes rather than filtered by key per request.
         """
+        cache_key = (self.project_id, self.dataset_id)
+        with _catalog_cache_lock:
+            catalog = _catalog_cache.get(cache_key)
+        if catalog is not None:
+            return catalog
 
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ArrayQueryParameter("keys", "STRING", keys),
-            ]
-        )
+        results = self.client.query_and_wait(_SQL_CATALOG, job_config=self._job_config(query_parameters=[]))
 
-        query_job = self.client.query(query, job_config=job_config)
-        results = query_job.result()
+        catalog = {row.intervention_key: _row_to_dict(row) for row in results}
 
-        catalog_by_key: Dict[str, Dict[str, Any]] = {}
-        for row in results:
-            catalog_by_key[row.intervention_key] = {
-                "intervention_key": row.intervention_key,
-                "metric": row.metric,
-                "level": row.level,
-                "target_level": row.target_level,
-                "nudge_type": row.nudge_type,
-                "persona": row.persona,
-                "surface": row.surface,
-                "title": row.title,
-                "body": row.body,
-                "enabled": row.enabled,
-            }
-
-        return catalog_by_key
+        with _catalog_cache_lock:
+            _catalog_cache[cache_key] = catalog
+        return catalog
 
     def has_completed_flow(self, user_id: str, flow_id: str, flow_version: str = "v1") -> bool:
         """Check if user has completed a specific flow version.
@@ -174,42 +259,14 @@ class ContextRepository:
         Returns:
             True if flow is completed (not reset), False otherwise
         """
-        query = f"""
-            WITH cte_events AS (
-                SELECT
-                    event_type,
-                    JSON_EXTRACT_SCALAR(payload, '$.flow_id') AS flow_id,
-                    JSON_EXTRACT_SCALAR(payload, '$.flow_version') AS flow_version,
-                    JSON_EXTRACT_SCALAR(payload, '$.scope') AS scope,
-                    timestamp
-                FROM `{self.project_id}.{self.dataset_id}.app_interactions`
-                WHERE user_id = @user_id
-                  AND event_type IN ('flow_completed', 'flow_reset')
-                  AND (
-                    JSON_EXTRACT_SCALAR(payload, '$.flow_id') = @flow_id
-                    OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'all'
-                    OR JSON_EXTRACT_SCALAR(payload, '$.scope') = 'flows'
-                  )
-                ORDER BY timestamp DESC
-            )
-            SELECT
-                event_type,
-                flow_id,
-                flow_version,
-                timestamp
-            FROM cte_events
-            LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
+        job_config = self._job_config(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
                 bigquery.ScalarQueryParameter("flow_id", "STRING", flow_id),
             ]
         )
         
-        query_job = self.client.query(query, job_config=job_config)
-        results = query_job.result()
+        results = self.client.query_and_wait(_SQL_LATEST_FLOW_EVENT, job_config=job_config)
         
         for row in results:
             if row.event_type == "flow_completed":
@@ -222,7 +279,26 @@ class ContextRepository:
         
         return False
 
+    def has_recent_flow_request(self, user_id: str, flow_id: str, minutes: int = 5) -> bool:
+        """Check if user has requested a flow recently (e.g., via About SHIFT).
 
+        Args:
+            user_id: User ID
+            flow_id: Flow ID (e.g., "getting_started")
+            minutes: Time window in minutes (default 5)
 
+        Returns:
+            True if a flow_requested event was logged in the last N minutes
+        """
+        job_config = self._job_config(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
+                bigquery.ScalarQueryParameter("flow_id", "STRING", flow_id),
+                bigquery.ScalarQueryParameter("minutes", "INT64", minutes),
+            ]
+        )
 
+        results = self.client.query_and_wait(_SQL_RECENT_FLOW_REQUEST, job_config=job_config)
 
+        # Any row means a matching request exists
+        return next(iter(results), None) is not None
@@ -1,5 +1,6 @@
 """FastAPI application for SHIFT backend."""
 
+import asyncio
 import secrets
 from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI, HTTPException, Depends, Header, Request
@@ -25,8 +26,7 @@ from uuid import uuid4
 import os
 import json
 
-from context_repository import ContextRepository
-from google.cloud import bigquery
+from context_repository import ContextRepository, get_bigquery_client
 
 # Lazy import intervention selector modules (for creating getting_started instance)
 # These are only used in /context endpoint and may not be available in all environments
@@ -390,7 +390,7 @@ async def app_interactions(
                 detail="GCP_PROJECT_ID not configured"
             )
         
-        bq_client = bigquery.Client(project=project_id)
+        bq_client = get_bigquery_client(project_id)
         table_id = f"{project_id}.shift_data.app_interactions"
         
         # Generate interaction_id
@@ -502,38 +502,28 @@ async def get_context(
 
         user_id = current_user.user_id
 
-        # Check if getting_started should be shown and create instance if needed
-        # This handles the case where selector hasn't run yet (no state estimate)
-        getting_started_completed = repo.has_completed_flow(user_id, "getting_started", "v1")
-        flow_requested = False
-        try:
+        def check_flow_requested() -> bool:
             # Check for recent flow_requested events (within last 5 minutes)
-            query = f"""
-                SELECT COUNT(*) as count
-                FROM `{project_id}.shift_data.app_interactions`
-                WHERE user_id = @user_id
-                  AND event_type = 'flow_requested'
-                  AND JSON_EXTRACT_SCALAR(payload, '$.flow_id') = 'getting_started'
-                  AND timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 5 MINUTE)
-            """
-            bq_client = bigquery.Client(project=project_id)
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
-                ]
-            )
-            query_job = bq_client.query(query, job_config=job_config)
-            results = query_job.result()
-            for row in results:
-                flow_requested = row.count > 0
-        except Exception as e:
-            print(f"⚠️ Error checking flow_requested: {e}")
-        
-        # Latest state estimate (optional)
-        state_estimate = repo.get_latest_state_estimate(user_id=user_id)
-
-        # All created intervention instances for this user
-        instances = repo.get_created_interventions_for_user(user_id=user_id)
+            try:
+                return repo.has_recent_flow_request(user_id, "getting_started", minutes=5)
+            except Exception as e:
+                print(f"⚠️ Error checking flow_requested: {e}")
+                return False
+
+        # The four lookups below are independent BigQuery round trips; run them
+        # concurrently (off the event loop) so the request waits for the slowest
+        # one instead of their sum.
+        # - getting_started completion and recent re-requests decide whether the
+        #   getting_started intervention is shown, even before the selector has
+        #   run (no state estimate yet)
+        # - latest state estimate (optional)
+        # - all created intervention instances for this user
+        getting_started_completed, flow_requested, state_estimate, instances = await asyncio.gather(
+            asyncio.to_thread(repo.has_completed_flow, user_id, "getting_started", "v1"),
+            asyncio.to_thread(check_flow_requested),
+            asyncio.to_thread(repo.get_latest_state_estimate, user_id=user_id),
+            asyncio.to_thread(repo.get_created_interventions_for_user, user_id=user_id),
+        )
 
         # Look up catalog details for all intervention_keys
         keys = list({instance["intervention_key"] for instance in instances})
@@ -745,7 +735,7 @@ async def reset_user_data(
                 detail="GCP_PROJECT_ID not configured"
             )
         
-        bq_client = bigquery.Client(project=project_id)
+        bq_client = get_bigquery_client(project_id)
         table_id = f"{project_id}.shift_data.app_interactions"
         
         # Generate interaction_id and trace_id
@@ -38,6 +38,7 @@ def test_context_returns_getting_started(client, mock_user):
     with patch('watch_events.main.ContextRepository') as MockRepo:
         mock_repo_instance = MockRepo.return_value
         mock_repo_instance.has_completed_flow.return_value = False
+        mock_repo_instance.has_recent_flow_request.return_value = False
         mock_repo_instance.get_latest_state_estimate.return_value = None
         mock_repo_instance.get_created_interventions_for_user.return_value = []
         mock_repo_instance.get_catalog_for_keys.return_value = {}
@@ -125,6 +126,7 @@ def test_context_hides_getting_started_when_completed(client, mock_user):
     with patch('watch_events.main.ContextRepository') as MockRepo:
         mock_repo_instance = MockRepo.return_value
         mock_repo_instance.has_completed_flow.return_value = True  # Flow completed!
+        mock_repo_instance.has_recent_flow_request.return_value = False
         mock_repo_instance.get_latest_state_estimate.return_value = None
         mock_repo_instance.get_created_interventions_for_user.return_value = []
         mock_repo_instance.get_catalog_for_keys.return_value = {}
@@ -163,6 +165,7 @@ def test_getting_started_has_unique_trace_ids(client, mock_user):
     with patch('watch_events.main.ContextRepository') as MockRepo:
         mock_repo_instance = MockRepo.return_value
         mock_repo_instance.has_completed_flow.return_value = False
+        mock_repo_instance.has_recent_flow_request.return_value = False
         mock_repo_instance.get_latest_state_estimate.return_value = None
         mock_repo_instance.get_created_interventions_for_user.return_value = []
         mock_repo_instance.get_catalog_for_keys.return_value = {}
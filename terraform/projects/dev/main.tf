@@ -64,6 +64,13 @@ resource "google_project_service" "pubsub" {
   disable_on_destroy = false
 }
 
+resource "google_project_service" "bigquery_data_transfer" {
+  service = "bigquerydatatransfer.googleapis.com"
+  project = var.project_id
+  
+  disable_on_destroy = false
+}
+
 # Enable Identity Platform (optional - only needed for real Apple auth)
 resource "google_identity_platform_config" "default" {
   count   = var.enable_identity_platform ? 1 : 0
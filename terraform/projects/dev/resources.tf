@@ -87,6 +87,10 @@ resource "google_bigquery_table" "state_estimates" {
   table_id   = "state_estimates"
   project    = var.project_id
 
+  # Latest-estimate lookups filter on user_id and order by timestamp, so only
+  # the user's blocks are read
+  clustering = ["user_id", "timestamp"]
+
   schema = <<EOF
 [
   {
@@ -188,6 +192,10 @@ resource "google_bigquery_table" "intervention_instances" {
   table_id   = "intervention_instances"
   project    = var.project_id
 
+  # Point lookups by ID (BigQueryClient.get_intervention_instance) prune to
+  # the matching storage blocks instead of scanning the whole table
+  clustering = ["intervention_instance_id"]
+
   schema = <<EOF
 [
   {
@@ -251,12 +259,95 @@ EOF
   depends_on = [google_bigquery_dataset.shift_data]
 }
 
+# BigQuery Table for Intervention Instance status changes
+# intervention_selector appends here instead of running a DML UPDATE per send;
+# fold_intervention_instance_events merges the log into intervention_instances
+resource "google_bigquery_table" "intervention_instance_events" {
+  dataset_id = google_bigquery_dataset.shift_data.dataset_id
+  table_id   = "intervention_instance_events"
+  project    = var.project_id
+
+  time_partitioning {
+    type  = "DAY"
+    field = "event_time"
+  }
+
+  clustering = ["intervention_instance_id"]
+
+  schema = <<EOF
+[
+  {
+    "name": "intervention_instance_id",
+    "type": "STRING",
+    "mode": "REQUIRED"
+  },
+  {
+    "name": "status",
+    "type": "STRING",
+    "mode": "REQUIRED"
+  },
+  {
+    "name": "sent_at",
+    "type": "TIMESTAMP",
+    "mode": "NULLABLE"
+  },
+  {
+    "name": "event_time",
+    "type": "TIMESTAMP",
+    "mode": "REQUIRED"
+  }
+]
+EOF
+
+  depends_on = [google_bigquery_dataset.shift_data]
+}
+
+# BigQuery view of intervention_instances with unfolded status changes applied
+resource "google_bigquery_table" "intervention_instances_current" {
+  dataset_id = google_bigquery_dataset.shift_data.dataset_id
+  table_id   = "intervention_instances_current"
+  project    = var.project_id
+
+  view {
+    query = templatefile("${path.module}/sql/intervention_instances_current.sql", { project_id = var.project_id })
+    use_legacy_sql = false
+  }
+
+  depends_on = [
+    google_bigquery_table.intervention_instances,
+    google_bigquery_table.intervention_instance_events
+  ]
+}
+
+# Scheduled query folding intervention_instance_events into intervention_instances
+resource "google_bigquery_data_transfer_config" "fold_intervention_instance_events" {
+  display_name         = "fold_intervention_instance_events"
+  project              = var.project_id
+  location             = var.region
+  data_source_id       = "scheduled_query"
+  schedule             = "every 15 minutes"
+  service_account_name = google_service_account.intervention_selector.email
+
+  params = {
+    query = templatefile("${path.module}/sql/fold_intervention_instance_events.sql", { project_id = var.project_id })
+  }
+
+  depends_on = [
+    google_project_service.bigquery_data_transfer,
+    google_bigquery_table.intervention_instances,
+    google_bigquery_table.intervention_instance_events
+  ]
+}
+
 # BigQuery Table for Devices
 resource "google_bigquery_table" "devices" {
   dataset_id = google_bigquery_dataset.shift_data.dataset_id
   table_id   = "devices"
   project    = var.project_id
 
+  # Device token fallback lookups filter on user_id
+  clustering = ["user_id"]
+
   schema = <<EOF
 [
   {
@@ -291,6 +382,10 @@ resource "google_bigquery_table" "app_interactions" {
   table_id   = "app_interactions"
   project    = var.project_id
 
+  # Per-user flow lookups (has_completed_flow, has_recent_flow_request) filter
+  # on user_id and event_type, so only the matching blocks are read
+  clustering = ["user_id", "event_type"]
+
   schema = <<EOF
 [
   {
@@ -440,6 +535,13 @@ resource "google_project_iam_member" "intervention_selector_bq_job_user" {
   member  = "serviceAccount:${google_service_account.intervention_selector.email}"
 }
 
+# intervention_selector reads large query results over the Storage Read API
+resource "google_project_iam_member" "intervention_selector_bq_read_session_user" {
+  project = var.project_id
+  role    = "roles/bigquery.readSessionUser"
+  member  = "serviceAccount:${google_service_account.intervention_selector.email}"
+}
+
 resource "google_pubsub_topic_iam_member" "intervention_selector_pubsub_subscriber" {
   topic  = google_pubsub_topic.state_estimates.name
   role   = "roles/pubsub.subscriber"
@@ -495,6 +597,28 @@ resource "google_bigquery_table" "surface_preferences" {
 }
 
 
+# BigQuery materialized view of per-user flow completion state
+# has_completed_flow reads a few pre-aggregated rows instead of scanning app_interactions
+resource "google_bigquery_table" "v_user_flow_state" {
+  dataset_id = google_bigquery_dataset.shift_data.dataset_id
+  table_id   = "v_user_flow_state"
+  project    = var.project_id
+
+  clustering = ["user_id"]
+
+  materialized_view {
+    query               = templatefile("${path.module}/sql/v_user_flow_state.sql", { project_id = var.project_id })
+    enable_refresh      = true
+    refresh_interval_ms = 300000
+  }
+
+  depends_on = [
+    google_bigquery_dataset.shift_data,
+    google_bigquery_table.app_interactions
+  ]
+}
+
+
 # Data source to read the state_estimator input view SQL file
 data "local_file" "v_state_estimator_input_v1_sql" {
   filename = "${path.module}/sql/v_state_estimator_input_v1.sql"
@@ -0,0 +1,36 @@
+-- Folds status changes logged by the intervention selector into intervention_instances
+-- Runs as a scheduled query; status only changes for instances still in 'created' so that
+-- later status changes written directly (e.g. accepted/dismissed from watch_events) win,
+-- while sent_at is recorded whatever the current status
+-- event_time is stamped by the client before the append commits, so the cutoff lags
+-- behind now: an event stamped before it but committed after the MERGE read its
+-- snapshot would otherwise be deleted without being folded
+
+DECLARE cutoff TIMESTAMP DEFAULT TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 10 MINUTE);
+
+MERGE `${project_id}.shift_data.intervention_instances` ii
+USING (
+  WITH cte_ranked_events AS (
+    SELECT
+      intervention_instance_id,
+      status,
+      sent_at,
+      ROW_NUMBER() OVER (PARTITION BY intervention_instance_id ORDER BY event_time DESC) AS rn
+    FROM `${project_id}.shift_data.intervention_instance_events`
+    WHERE event_time <= cutoff
+  )
+  SELECT
+    intervention_instance_id,
+    status,
+    sent_at
+  FROM cte_ranked_events
+  WHERE rn = 1
+) e
+ON ii.intervention_instance_id = e.intervention_instance_id
+WHEN MATCHED THEN
+  UPDATE SET
+    status = IF(ii.status = 'created', e.status, ii.status),
+    sent_at = COALESCE(e.sent_at, ii.sent_at);
+
+DELETE FROM `${project_id}.shift_data.intervention_instance_events`
+WHERE event_time <= cutoff;
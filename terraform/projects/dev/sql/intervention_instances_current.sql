@@ -0,0 +1,29 @@
+-- intervention_instances with pending status changes from intervention_instance_events applied
+-- Events are folded into intervention_instances by the fold_intervention_instance_events scheduled query;
+-- until then the latest event supplies the status of a still-'created' instance and, for any
+-- instance, its sent_at
+
+WITH cte_ranked_events AS (
+  SELECT
+    intervention_instance_id,
+    status,
+    sent_at,
+    ROW_NUMBER() OVER (PARTITION BY intervention_instance_id ORDER BY event_time DESC) AS rn
+  FROM `${project_id}.shift_data.intervention_instance_events`
+),
+cte_latest_events AS (
+  SELECT
+    intervention_instance_id,
+    status,
+    sent_at
+  FROM cte_ranked_events
+  WHERE rn = 1
+)
+SELECT
+  ii.* REPLACE (
+    IF(ii.status = 'created' AND e.status IS NOT NULL, e.status, ii.status) AS status,
+    COALESCE(e.sent_at, ii.sent_at) AS sent_at
+  )
+FROM `${project_id}.shift_data.intervention_instances` ii
+LEFT JOIN cte_latest_events e
+  ON ii.intervention_instance_id = e.intervention_instance_id
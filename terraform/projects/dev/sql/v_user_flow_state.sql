@@ -0,0 +1,17 @@
+-- Latest flow_completed / flow_reset event per user and flow, for has_completed_flow
+-- flow_key is the event's flow_id, or '*' for resets scoped to all flows ('all' / 'flows')
+-- Readers take the latest row for flow_key IN (<flow_id>, '*')
+
+SELECT
+  user_id,
+  IF(
+    JSON_EXTRACT_SCALAR(payload, '$.scope') IN ('all', 'flows'),
+    '*',
+    JSON_EXTRACT_SCALAR(payload, '$.flow_id')
+  ) AS flow_key,
+  event_type,
+  JSON_EXTRACT_SCALAR(payload, '$.flow_version') AS flow_version,
+  MAX(timestamp) AS last_event_at
+FROM `${project_id}.shift_data.app_interactions`
+WHERE event_type IN ('flow_completed', 'flow_reset')
+GROUP BY user_id, flow_key, event_type, flow_version